@@ -0,0 +1,160 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from agents.llm_registry import get_llm
+from agents.message_normalizer import normalize_messages
+from tools.search_results import estimate_tokens
+
+SUMMARY_PROMPT = """You maintain a running summary of a mental health support conversation so specialists can pick it up without the full transcript.
+
+Update the existing summary with the new messages. Keep, in plain sentences: the user's main concerns and how they have changed, any safety or crisis indicators and how they were handled, coping strategies, exercises, plans and resources already given, and anything the user said they prefer or want to avoid. Leave out greetings and small talk. Reply with the updated summary only, at most {max_words} words."""
+
+@lru_cache(maxsize=1)
+def _llm_config() -> dict:
+    # Imported lazily: the graphs package imports the agents while it is being built
+    from graphs.graph_config import load_graph_config
+    return load_graph_config().llm_config
+
+def _message_tokens(message: Dict[str, Any]) -> int:
+    return estimate_tokens(str(message.get("content", ""))) + 4
+
+def _window_start(messages: List[Dict[str, Any]], recent_turns: int) -> int:
+    """Index of the first message of the last `recent_turns` turns (a turn starts at a user message)."""
+    turns = 0
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].get("role") == "user":
+            turns += 1
+            if turns == recent_turns:
+                return index
+    return 0
+
+class ContextWindowManager:
+    """Keeps each agent's prompt history within a token budget.
+
+    Agents get the last `recent_turns` turns verbatim, oldest messages
+    trimmed first if that's still over the agent's budget, preceded by a
+    rolling summary of everything older. Summaries are refreshed after a
+    turn on a background thread, so no agent call waits for one.
+    """
+
+    def __init__(self, recent_turns: int = 6, summary_trigger_messages: int = 8, summary_max_tokens: int = 300):
+        self.recent_turns = recent_turns
+        self.summary_trigger_messages = summary_trigger_messages
+        self.summary_max_tokens = summary_max_tokens
+        self.refreshes = 0
+        self.failures = 0
+
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self._pending = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="context-summary")
+
+    def summary_for(self, state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Latest summary for the state's session: the manager's copy, else the one saved in session_context."""
+        summary = self._summaries.get(state.get("session_id"))
+        if summary is None:
+            summary = (state.get("session_context") or {}).get("conversation_summary")
+        return summary
+
+    def build(self, state: Dict[str, Any], token_budget: int) -> List[Dict[str, Any]]:
+        """Return the summary (if any) plus recent messages that fit in token_budget."""
+        messages = normalize_messages(state.get("messages", []))
+        summary = self.summary_for(state)
+        covered = summary["covered"] if summary else 0
+
+        # Messages the summary doesn't cover yet stay verbatim until it catches up
+        start = min(_window_start(messages, self.recent_turns), covered)
+        recent = messages[start:]
+
+        prefix = []
+        used = 0
+        if summary and covered:
+            note = {"role": "system", "content": f"Summary of the earlier conversation:\n{summary['text']}"}
+            prefix.append(note)
+            used += _message_tokens(note)
+
+        # Drop the oldest messages first, but always keep the latest one
+        kept = []
+        for message in reversed(recent):
+            cost = _message_tokens(message)
+            if kept and used + cost > token_budget:
+                break
+            kept.append(message)
+            used += cost
+
+        return prefix + kept[::-1]
+
+    def schedule_refresh(self, session_id: str, state: Dict[str, Any]) -> None:
+        """Fold messages that left the recent window into the summary, on the background thread."""
+        messages = normalize_messages(state.get("messages", []))
+        summary = self.summary_for(state)
+        covered = summary["covered"] if summary else 0
+        window_start = _window_start(messages, self.recent_turns)
+
+        if window_start - covered < self.summary_trigger_messages:
+            return
+
+        with self._lock:
+            if session_id in self._pending:
+                return
+            self._pending.add(session_id)
+
+        self._executor.submit(self._refresh, session_id, summary, messages[covered:window_start], window_start)
+
+    def _refresh(self, session_id: str, summary: Optional[Dict[str, Any]], new_messages: List[Dict[str, Any]], covered: int) -> None:
+        try:
+            transcript = "\n".join(f"{message['role']}: {message['content']}" for message in new_messages)
+            response = get_llm().bind(max_tokens=self.summary_max_tokens).invoke([
+                {"role": "system", "content": SUMMARY_PROMPT.format(max_words=int(self.summary_max_tokens * 0.75))},
+                {"role": "user", "content": f"Existing summary:\n{summary['text'] if summary else '(none)'}\n\nNew messages:\n{transcript}"}
+            ])
+            with self._lock:
+                current = self._summaries.get(session_id)
+                if current is None or current["covered"] < covered:
+                    self._summaries[session_id] = {"text": response.content.strip(), "covered": covered}
+                    self.refreshes += 1
+        except Exception:
+            # The next turn retries; until then the older messages stay verbatim
+            self.failures += 1
+        finally:
+            with self._lock:
+                self._pending.discard(session_id)
+
+    def end_session(self, session_id: str) -> None:
+        with self._lock:
+            self._summaries.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._summaries),
+            "pending": len(self._pending),
+            "refreshes": self.refreshes,
+            "failures": self.failures
+        }
+
+_context_window: Optional[ContextWindowManager] = None
+_context_window_lock = threading.Lock()
+
+def get_context_window() -> ContextWindowManager:
+    """Return the shared context window manager, configured from GraphConfig.llm_config."""
+    global _context_window
+
+    if _context_window is None:
+        with _context_window_lock:
+            if _context_window is None:
+                config = _llm_config()
+                _context_window = ContextWindowManager(
+                    recent_turns=config["recent_turns"],
+                    summary_trigger_messages=config["summary_trigger_messages"],
+                    summary_max_tokens=config["summary_max_tokens"]
+                )
+
+    return _context_window
+
+def context_messages(agent_name: str, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Conversation history for an agent's prompt, within that agent's token budget."""
+    config = _llm_config()
+    budget = config["context_budgets"].get(agent_name, config["default_context_budget"])
+    return get_context_window().build(state, budget)
@@ -3,19 +3,9 @@ from langchain.chat_models import init_chat_model
 from pydantic import BaseModel, Field
 from typing import Literal
 from states.enhanced_state import EnhancedState
+from tools.crisis_matcher import effective_crisis_level
 
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-from langchain_groq import ChatGroq
-
-# Initialize LLM
-llm = ChatGroq(
-    model_name=os.getenv("MODEL_NAME"),
-    api_key=os.getenv("GROQ_API_KEY")
-)
+from agents.llm_registry import get_structured_llm
 
 class AgentRouter(BaseModel):
     recommended_agent: Literal[
@@ -33,18 +23,19 @@ def coordinator_agent(state: EnhancedState) -> Command[Literal["crisis_agent", "
     """Master coordinator that intelligently routes between specialized agents."""
     
     last_message = state["messages"][-1].content if state["messages"] else ""
-    crisis_level = state.get("crisis_level", 0)
+    # Assessed level or risk built up across the conversation, whichever is higher
+    crisis_level = effective_crisis_level(state)
     current_agent = state.get("current_agent")
     
     # Crisis override - always prioritize safety
-    if crisis_level and crisis_level > 7:
+    if crisis_level > 7:
         return Command(
             goto="crisis_agent",
             update={"current_agent": "crisis"}
         )
     
     # Intelligent routing based on conversation analysis
-    routing_llm = llm.with_structured_output(AgentRouter)
+    routing_llm = get_structured_llm(AgentRouter)
     
     conversation_context = ""
     if len(state["messages"]) > 1:
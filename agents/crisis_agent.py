@@ -1,39 +1,28 @@
 from langgraph.types import Command
 from typing import Literal
 from states.enhanced_state import EnhancedState
+from tools.tool_executor import failed_round_reply, run_tool_calls, tool_messages, tool_spec
+from tools.tool_memo import load_tool_memo
 from tools.crisis_tools import find_crisis_resources, create_safety_plan
 
-import os
-from dotenv import load_dotenv
+from agents.context_window import context_messages
+from agents.llm_registry import get_llm, get_tool_llm
 
-load_dotenv()
+CRISIS_TOOL_SPECS = {
+    "find_crisis_resources": tool_spec(find_crisis_resources, "🚨 CRISIS RESOURCES", {"location": "general"}),
+    "create_safety_plan": tool_spec(create_safety_plan, "🛡️ SAFETY PLAN", {"triggers": "general stress"})
+}
 
-# Initialize LLM
-from langchain_groq import ChatGroq
-
-# Initialize LLM
-llm = ChatGroq(
-    model_name=os.getenv("MODEL_NAME"),
-    api_key=os.getenv("GROQ_API_KEY")
-)
+# Reply when every tool call in a round fails
+CRISIS_FALLBACK_REPLY = "I wasn't able to look up resources just now, but help is available right away: call or text 988 (Suicide & Crisis Lifeline), text HOME to 741741, or call 911 if you are in immediate danger."
 
 def crisis_agent(state: EnhancedState) -> Command[Literal["coordinator_agent", "__end__"]]:
     """Specialized crisis intervention and safety planning agent."""
 
-    conversation_messages = []
-    for msg in state.get("messages", []):
-        if hasattr(msg, 'content') and hasattr(msg, 'type'):
-            # LangChain message object
-            conversation_messages.append({
-                "role": "user" if msg.type == "human" else "assistant" if msg.type == "ai" else msg.type,
-                "content": msg.content
-            })
-        elif isinstance(msg, dict) and "role" in msg and "content" in msg:
-            # Already a proper message dict
-            conversation_messages.append(msg)
+    conversation_messages = context_messages("crisis_agent", state)
     
     crisis_tools = [find_crisis_resources, create_safety_plan]
-    crisis_llm = llm.bind_tools(crisis_tools)
+    crisis_llm = get_tool_llm(crisis_tools)
     
     messages = [
         {"role": "system",
@@ -58,35 +47,17 @@ def crisis_agent(state: EnhancedState) -> Command[Literal["coordinator_agent", "
     
     # Handle crisis tool execution
     if response.tool_calls:
-        tool_results = []
-        for tool_call in response.tool_calls:
-            if tool_call["name"] == "find_crisis_resources":
-                result = find_crisis_resources.invoke({
-                    "location": tool_call["args"].get("location", "general")
-                })
-                tool_results.append(f"🚨 CRISIS RESOURCES: {result}")
-
-            elif tool_call["name"] == "create_safety_plan":
-                result = create_safety_plan.invoke({
-                    "triggers": tool_call["args"].get("triggers", "general stress")
-                })
-                tool_results.append(f"🛡️ SAFETY PLAN: {result}")
-
+        tool_memo = load_tool_memo(state)
+        tool_results = run_tool_calls(response.tool_calls, CRISIS_TOOL_SPECS, tool_memo)
         
-        if tool_results:
-            final_messages = messages + [response] + [
-                {
-                    "role": "tool",
-                    "content": tool_result,
-                    "tool_call_id": tool_call["id"]
-                }
-                for tool_result, tool_call in zip(tool_results, response.tool_calls)
-            ]
-            final_response = llm.invoke(final_messages)
+        if any(result["ok"] for result in tool_results):
+            final_messages = messages + [response] + tool_messages(tool_results)
+            final_response = get_llm().invoke(final_messages)
             
             return Command(
                 update={
                     "messages": [final_response],
+                    "tool_memo": tool_memo,
                     "current_agent": "crisis",
                     "intervention_plan": {
                         "type": "crisis_intervention",
@@ -96,6 +67,16 @@ def crisis_agent(state: EnhancedState) -> Command[Literal["coordinator_agent", "
                 },
                 goto="__end__"
             )
+
+        # Every call failed: keep the memo counters and don't leave the tool calls unanswered
+        return Command(
+            update={
+                "messages": [failed_round_reply(response, CRISIS_FALLBACK_REPLY)],
+                "tool_memo": tool_memo,
+                "current_agent": "crisis"
+            },
+            goto="__end__"
+        )
     
     return Command(
         update={
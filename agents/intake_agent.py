@@ -1,21 +1,13 @@
 from langgraph.types import Command
 from pydantic import BaseModel, Field
+from functools import lru_cache
 from typing import Literal, Optional
 from states.enhanced_state import EnhancedState
-from tools.crisis_tools import assess_crisis_level
+from tools.crisis_matcher import update_crisis_score
+from tools.crisis_tools import assess_crisis_level, find_crisis_resources
 
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-from langchain_groq import ChatGroq
-
-# Initialize LLM
-llm = ChatGroq(
-    model_name=os.getenv("MODEL_NAME"),
-    api_key=os.getenv("GROQ_API_KEY")
-)
+from agents.context_window import context_messages
+from agents.llm_registry import get_structured_llm, get_tool_llm
 
 class IntakeAssessment(BaseModel):
     primary_concern: str = Field(description="Main issue the user is presenting")
@@ -23,24 +15,48 @@ class IntakeAssessment(BaseModel):
     recommended_agent: Literal["crisis_agent", "therapeutic_agent", "resource_coordinator_agent", "wellness_coach_agent"] = Field(description="Best agent to handle this case")
     reasoning: str = Field(description="Brief explanation for the recommendation")
 
+@lru_cache(maxsize=1)
+def _crisis_config() -> dict:
+    # Imported lazily: the graphs package imports this module while it is being built
+    from graphs.graph_config import load_graph_config
+    return load_graph_config().crisis_config
+
 def intake_agent(state: EnhancedState) -> Command[Literal["crisis_agent", "therapeutic_agent", "resource_coordinator_agent", "wellness_coach_agent", "__end__"]]:
     """Initial assessment and routing agent."""
 
-    conversation_messages = []
-    for msg in state.get("messages", []):
-        if hasattr(msg, 'content') and hasattr(msg, 'type'):
-            # LangChain message object
-            conversation_messages.append({
-                "role": "user" if msg.type == "human" else "assistant" if msg.type == "ai" else msg.type,
-                "content": msg.content
-            })
-        elif isinstance(msg, dict) and "role" in msg and "content" in msg:
-            # Already a proper message dict
-            conversation_messages.append(msg)
+    crisis_config = _crisis_config()
+
+    # Score only the new messages into the rolling conversation-level crisis score
+    crisis_score = update_crisis_score(
+        state.get("crisis_score"),
+        state.get("messages", []),
+        decay=crisis_config["rolling_decay"]
+    )
+
+    # Screen the latest message before any LLM call so a user in crisis gets
+    # resources immediately; the crisis agent's reply follows
+    last_message = state["messages"][-1].content if state["messages"] else ""
+    if crisis_score["latest"] >= crisis_config["immediate_intervention_threshold"]:
+        crisis_resources = find_crisis_resources.invoke({"location": "general"})
+        return Command(
+            goto="crisis_agent",
+            update={
+                "messages": [{"role": "assistant", "content": crisis_resources}],
+                "crisis_level": crisis_score["latest"],
+                "crisis_score": crisis_score,
+                "current_agent": "crisis",
+                "session_context": {
+                    "intake_notes": "Crisis intervention needed",
+                    "crisis_resources": crisis_resources
+                }
+            }
+        )
+
+    conversation_messages = context_messages("intake_agent", state)
     
     # Bind assessment tools
     intake_tools = [assess_crisis_level]
-    intake_llm = llm.bind_tools(intake_tools)
+    intake_llm = get_tool_llm(intake_tools)
     
     messages = [
         {
@@ -61,23 +77,23 @@ def intake_agent(state: EnhancedState) -> Command[Literal["crisis_agent", "thera
     response = intake_llm.invoke(messages)
     
     # Assess crisis level
-    last_message = state["messages"][-1].content if state["messages"] else ""
     crisis_assessment = assess_crisis_level.invoke(last_message)
     
-    # If immediate crisis detected, route to crisis agent
-    if crisis_assessment["immediate_action_needed"]:
+    # If immediate crisis detected, or risk has built up over the conversation, route to crisis agent
+    if crisis_assessment["immediate_action_needed"] or crisis_score["level"] >= crisis_config["high_risk_threshold"]:
         return Command(
             goto="crisis_agent",
             update={
                 "messages": [response],
-                "crisis_level": crisis_assessment["risk_level"],
+                "crisis_level": max(crisis_assessment["risk_level"], crisis_score["level"]),
+                "crisis_score": crisis_score,
                 "current_agent": "crisis",
                 "session_context": {"intake_notes": "Crisis intervention needed"}
             }
         )
     
     # Use structured assessment for routing
-    assessment_llm = llm.with_structured_output(IntakeAssessment)
+    assessment_llm = get_structured_llm(IntakeAssessment)
     assessment = assessment_llm.invoke([
         {"role": "system", 
          "content":"""Based on the conversation, assess the user's needs and recommend the most appropriate specialist:
@@ -121,6 +137,7 @@ def intake_agent(state: EnhancedState) -> Command[Literal["crisis_agent", "thera
         goto=assessment.recommended_agent,
         update={
             "messages": [state["messages"][-1].content],
+            "crisis_score": crisis_score,
             "current_agent": assessment.recommended_agent.replace("_agent", ""),
             "session_context": {
                 "primary_concern": assessment.primary_concern,
@@ -0,0 +1,143 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.runnables import Runnable
+from langchain_groq import ChatGroq
+
+class LLMRegistry:
+    """Process-wide registry of chat model clients, created on first use.
+
+    Every model shares one pooled sync and one pooled async HTTP client, so
+    the pool's connection limit caps concurrent LLM requests across all
+    agents. An optional shared rate limiter paces request starts.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_second: float = 0.0,
+        timeout: float = 60.0
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._models: Dict[str, ChatGroq] = {}
+        self._runnables: Dict[Tuple[Any, ...], Runnable] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._http_async_client: Optional[httpx.AsyncClient] = None
+        self._rate_limiter: Optional[InMemoryRateLimiter] = None
+
+    def _ensure_clients(self) -> None:
+        if self._http_client is not None:
+            return
+
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency
+        )
+        # Waiting for a free connection counts against the same timeout as the request
+        timeout = httpx.Timeout(self.timeout, connect=10.0)
+        self._http_client = httpx.Client(limits=limits, timeout=timeout)
+        self._http_async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+
+        if self.requests_per_second > 0:
+            self._rate_limiter = InMemoryRateLimiter(
+                requests_per_second=self.requests_per_second,
+                max_bucket_size=max(1, self.max_concurrency)
+            )
+
+    def get(self, model_name: Optional[str] = None) -> ChatGroq:
+        """Return the shared client for a model (MODEL_NAME by default)."""
+        model_name = model_name or os.getenv("MODEL_NAME")
+
+        llm = self._models.get(model_name)
+        if llm is not None:
+            return llm
+
+        with self._lock:
+            llm = self._models.get(model_name)
+            if llm is None:
+                self._ensure_clients()
+                llm = ChatGroq(
+                    model_name=model_name,
+                    api_key=os.getenv("GROQ_API_KEY"),
+                    http_client=self._http_client,
+                    http_async_client=self._http_async_client,
+                    rate_limiter=self._rate_limiter
+                )
+                self._models[model_name] = llm
+
+        return llm
+
+    def _prepared(self, key: Tuple[Any, ...], model_name: Optional[str], build) -> Runnable:
+        runnable = self._runnables.get(key)
+        if runnable is None:
+            # Fetched before taking the lock: get() takes it too, and it isn't reentrant
+            llm = self.get(model_name)
+            with self._lock:
+                runnable = self._runnables.get(key)
+                if runnable is None:
+                    runnable = build(llm)
+                    self._runnables[key] = runnable
+        return runnable
+
+    def with_tools(self, tools: Sequence[Any], model_name: Optional[str] = None) -> Runnable:
+        """Return the model with these tools bound, building the tool schemas once per (model, toolset)."""
+        model_name = model_name or os.getenv("MODEL_NAME")
+        key = ("tools", model_name, tuple(tool.name for tool in tools))
+        return self._prepared(key, model_name, lambda llm: llm.bind_tools(list(tools)))
+
+    def with_structured_output(self, schema: Any, model_name: Optional[str] = None) -> Runnable:
+        """Return the model constrained to a Pydantic schema, built once per (model, schema)."""
+        model_name = model_name or os.getenv("MODEL_NAME")
+        key = ("structured", model_name, schema)
+        return self._prepared(key, model_name, lambda llm: llm.with_structured_output(schema))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "models": sorted(str(name) for name in self._models),
+            "prepared_runnables": len(self._runnables),
+            "max_concurrency": self.max_concurrency,
+            "requests_per_second": self.requests_per_second
+        }
+
+_llm_registry: Optional[LLMRegistry] = None
+_llm_registry_lock = threading.Lock()
+
+def get_llm_registry() -> LLMRegistry:
+    """Return the shared LLM registry, loading .env once on first use.
+
+    Limits come from LLM_MAX_CONCURRENCY, LLM_REQUESTS_PER_SECOND and
+    LLM_TIMEOUT.
+    """
+    global _llm_registry
+
+    if _llm_registry is None:
+        with _llm_registry_lock:
+            if _llm_registry is None:
+                load_dotenv()
+                _llm_registry = LLMRegistry(
+                    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+                    requests_per_second=float(os.getenv("LLM_REQUESTS_PER_SECOND", "0")),
+                    timeout=float(os.getenv("LLM_TIMEOUT", "60"))
+                )
+
+    return _llm_registry
+
+def get_llm(model_name: Optional[str] = None) -> ChatGroq:
+    """Return the shared chat model client for a model (MODEL_NAME by default)."""
+    return get_llm_registry().get(model_name)
+
+def get_tool_llm(tools: Sequence[Any], model_name: Optional[str] = None) -> Runnable:
+    """Return the shared model with tools bound (prepared once per model and toolset)."""
+    return get_llm_registry().with_tools(tools, model_name)
+
+def get_structured_llm(schema: Any, model_name: Optional[str] = None) -> Runnable:
+    """Return the shared model with structured output for a schema (prepared once per model and schema)."""
+    return get_llm_registry().with_structured_output(schema, model_name)
@@ -0,0 +1,111 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+def _message_id(msg: Any) -> Optional[str]:
+    if isinstance(msg, dict):
+        return msg.get("id")
+    return getattr(msg, "id", None)
+
+def convert_message(msg: Any) -> Optional[Dict[str, Any]]:
+    """Convert one state message into a role/content dict; None for anything unrecognized."""
+    if hasattr(msg, 'content') and hasattr(msg, 'type'):
+        # LangChain message object
+        return {
+            "role": "user" if msg.type == "human" else "assistant" if msg.type == "ai" else msg.type,
+            "content": msg.content
+        }
+    if isinstance(msg, dict) and "role" in msg and "content" in msg:
+        # Already a proper message dict
+        return msg
+    return None
+
+class MessageNormalizer:
+    """Converts state messages to role/content dicts, reusing earlier work.
+
+    Every agent node used to re-convert the whole history on each call. Here
+    a conversation's normalized history is remembered (keyed by the id of
+    its first message) as one list that grows with it, so a call only
+    converts and appends the messages added since the last one. Individually converted messages are also cached by id for
+    histories that were trimmed or reordered. Messages already in a history
+    are treated as immutable, as add_messages leaves them.
+    """
+
+    def __init__(self, max_messages: int = 50000, max_conversations: int = 1000):
+        self.max_messages = max_messages
+        self.max_conversations = max_conversations
+        self.converted = 0
+        self.reused = 0
+
+        self._lock = threading.Lock()
+        self._messages: "OrderedDict[str, tuple]" = OrderedDict()
+        self._histories: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def _convert(self, msg: Any) -> Optional[Dict[str, Any]]:
+        msg_id = _message_id(msg)
+        if msg_id is not None and not isinstance(msg, dict):
+            cached = self._messages.get(msg_id)
+            # A message replaced under the same id has new content
+            if cached is not None and (cached[0] is msg.content or cached[0] == msg.content):
+                self._messages.move_to_end(msg_id)
+                self.reused += 1
+                return cached[1]
+
+        converted = convert_message(msg)
+        self.converted += 1
+        if msg_id is not None and converted is not None and not isinstance(msg, dict):
+            self._messages[msg_id] = (msg.content, converted)
+            if len(self._messages) > self.max_messages:
+                self._messages.popitem(last=False)
+        return converted
+
+    def normalize(self, messages: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Return the role/content dicts for a history.
+
+        The returned list is the conversation's shared history, extended in
+        place by later calls; callers must not modify it or its dicts.
+        """
+        if not messages:
+            return []
+
+        with self._lock:
+            key = _message_id(messages[0])
+            history = self._histories.get(key) if key is not None else None
+            # Same conversation, only extended since last time
+            if history is not None and history["count"] <= len(messages) and _message_id(messages[history["count"] - 1]) == history["last_id"]:
+                self.reused += history["count"]
+                self._histories.move_to_end(key)
+            else:
+                history = {"count": 0, "last_id": None, "normalized": []}
+
+            normalized = history["normalized"]
+            for msg in messages[history["count"]:]:
+                converted = self._convert(msg)
+                if converted is not None:
+                    normalized.append(converted)
+
+            last_id = _message_id(messages[-1])
+            if key is not None and last_id is not None:
+                history["count"] = len(messages)
+                history["last_id"] = last_id
+                if self._histories.get(key) is not history:
+                    self._histories[key] = history
+                    self._histories.move_to_end(key)
+                    if len(self._histories) > self.max_conversations:
+                        self._histories.popitem(last=False)
+
+            return normalized
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "converted": self.converted,
+            "reused": self.reused,
+            "cached_messages": len(self._messages),
+            "cached_conversations": len(self._histories)
+        }
+
+message_normalizer = MessageNormalizer()
+
+def normalize_messages(messages: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Convert state messages to role/content dicts, only converting messages not seen before."""
+    return message_normalizer.normalize(messages)
@@ -2,6 +2,8 @@ from langgraph.types import Command
 from langchain.chat_models import init_chat_model
 from typing import Literal
 from states.enhanced_state import EnhancedState
+from tools.tool_executor import failed_round_reply, run_tool_calls, tool_messages, tool_spec
+from tools.tool_memo import load_tool_memo
 from tools.search_tools import (
     find_support_groups,
     find_therapists,
@@ -13,34 +15,25 @@ from tools.resource_tools import (
     medication_information
 )
 
-import os
-from dotenv import load_dotenv
+from agents.context_window import context_messages
+from agents.llm_registry import get_llm, get_tool_llm
 
-load_dotenv()
-
-from langchain_groq import ChatGroq
-
-# Initialize LLM
-llm = ChatGroq(
-    model_name=os.getenv("MODEL_NAME"),
-    api_key=os.getenv("GROQ_API_KEY")
-)
+RESOURCE_TOOL_SPECS = {
+    "find_support_groups": tool_spec(find_support_groups, "👥 SUPPORT GROUPS", {"format_preference": "both"}),
+    "find_therapists": tool_spec(find_therapists, "👨‍⚕️ THERAPISTS", {"insurance": "any"}),
+    "search_mental_health_resources": tool_spec(search_mental_health_resources, "📚 RESOURCES"),
+    "insurance_navigator": tool_spec(insurance_navigator, "💳 INSURANCE INFO"),
+    "mental_health_education": tool_spec(mental_health_education, "🎓 EDUCATION", {"reading_level": "general"}),
+    "medication_information": tool_spec(medication_information, "💊 MEDICATION INFO")
+}
 
+# Reply when every tool call in a round fails
+RESOURCE_FALLBACK_REPLY = "I couldn't look up resources just now. Please try again in a moment, or tell me your location and insurance so I can narrow the search."
 
 def resource_coordinator_agent(state: EnhancedState) -> Command[Literal["coordinator_agent", "__end__"]]:
     """Connects users with external resources and support systems."""
 
-    conversation_messages = []
-    for msg in state.get("messages", []):
-        if hasattr(msg, 'content') and hasattr(msg, 'type'):
-            # LangChain message object
-            conversation_messages.append({
-                "role": "user" if msg.type == "human" else "assistant" if msg.type == "ai" else msg.type,
-                "content": msg.content
-            })
-        elif isinstance(msg, dict) and "role" in msg and "content" in msg:
-            # Already a proper message dict
-            conversation_messages.append(msg)
+    conversation_messages = context_messages("resource_coordinator_agent", state)
     
     resource_tools = [
         find_support_groups,
@@ -50,7 +43,7 @@ def resource_coordinator_agent(state: EnhancedState) -> Command[Literal["coordin
         mental_health_education,
         medication_information
     ]
-    resource_llm = llm.bind_tools(resource_tools)
+    resource_llm = get_tool_llm(resource_tools)
     
     messages = [
         {"role": "system",
@@ -81,78 +74,35 @@ def resource_coordinator_agent(state: EnhancedState) -> Command[Literal["coordin
 
     # Handle resource search execution
     if response.tool_calls:
-        tool_results = []
-        for tool_call in response.tool_calls:
-
-            if tool_call["name"] == "find_support_groups":
-                result = find_support_groups.invoke({
-                    "location": tool_call["args"]["location"],
-                    "issue_type": tool_call["args"]["issue_type"],
-                    "format_preference": tool_call["args"].get("format_preference", "both")
-                })
-                tool_results.append(f"👥 SUPPORT GROUPS: {result}")
-                
-            elif tool_call["name"] == "find_therapists":
-                result = find_therapists.invoke({
-                    "location": tool_call["args"]["location"],
-                    "specialization": tool_call["args"]["specialization"],
-                    "insurance": tool_call["args"].get("insurance", "any")
-                })
-                tool_results.append(f"👨‍⚕️ THERAPISTS: {result}")
-                
-            elif tool_call["name"] == "search_mental_health_resources":
-                result = search_mental_health_resources.invoke({
-                    "topic": tool_call["args"]["topic"]
-                })
-                tool_results.append(f"📚 RESOURCES: {result}")
-                
-            elif tool_call["name"] == "insurance_navigator":
-                print("Inside tool call")
-                print("Insurance type:", tool_call["args"]["insurance_type"])
-                result = insurance_navigator.invoke({
-                    "insurance_type": tool_call["args"]["insurance_type"],
-                    "service_needed": tool_call["args"]["service_needed"]
-                })
-                print("Result:", result)
-                tool_results.append(f"💳 INSURANCE INFO: {result}")
-                
-            elif tool_call["name"] == "mental_health_education":
-                result = mental_health_education.invoke({
-                    "topic": tool_call["args"]["topic"],
-                    "reading_level": tool_call["args"].get("reading_level", "general")
-                })
-                tool_results.append(f"🎓 EDUCATION: {result}")
-                
-            elif tool_call["name"] == "medication_information":
-                result = medication_information.invoke({
-                    "medication_name": tool_call["args"]["medication_name"]
-                })
-                tool_results.append(f"💊 MEDICATION INFO: {result}")
-
+        tool_memo = load_tool_memo(state)
+        tool_results = run_tool_calls(response.tool_calls, RESOURCE_TOOL_SPECS, tool_memo)
         
-        if tool_results:
-            final_messages = messages + [response] + [
-                {
-                    "role": "tool",
-                    "content": tool_result,
-                    "tool_call_id": tool_call["id"]
-                }
-                for tool_result, tool_call in zip(tool_results, response.tool_calls)
-            ]
-            final_response = llm.invoke(final_messages)
+        if any(result["ok"] for result in tool_results):
+            final_messages = messages + [response] + tool_messages(tool_results)
+            final_response = get_llm().invoke(final_messages)
             
             return Command(
                 update={
                     "messages": [final_response],
+                    "tool_memo": tool_memo,
                     "current_agent": "resource_coordinator",
                     "intervention_plan": {
                         "type": "resource_coordination",
-                        "resources_found": len(tool_results),
+                        "resources_found": sum(result["ok"] for result in tool_results),
                         "resource_types": [tc["name"] for tc in response.tool_calls]
                     }
                 },
                 goto="__end__"
             )
+
+        # Every call failed: keep the memo counters and don't leave the tool calls unanswered
+        return Command(
+            update={
+                "messages": [failed_round_reply(response, RESOURCE_FALLBACK_REPLY)],
+                "tool_memo": tool_memo,
+                "current_agent": "resource_coordinator"
+            }
+        )
         
     print("Resource Coordinator Agent Run Successfully.")
     print("Here's the response: ", response)
@@ -2,46 +2,37 @@ from langgraph.types import Command
 from langchain.chat_models import init_chat_model
 from typing import Literal
 from states.enhanced_state import EnhancedState
+from tools.tool_executor import failed_round_reply, run_tool_calls, tool_messages, tool_spec
+from tools.tool_memo import load_tool_memo
 from tools.therapeutical_tools import (
     generate_cbt_exercise, 
     mindfulness_exercise_generator
 )
 from tools.wellness_tools import generate_coping_strategies
 
-import os
-from dotenv import load_dotenv
+from agents.context_window import context_messages
+from agents.llm_registry import get_llm, get_tool_llm
 
-load_dotenv()
+THERAPY_TOOL_SPECS = {
+    "generate_cbt_exercise": tool_spec(generate_cbt_exercise, "🧠 CBT EXERCISE", {"difficulty_level": "beginner"}),
+    "mindfulness_exercise_generator": tool_spec(mindfulness_exercise_generator, "🧘‍♀️ MINDFULNESS"),
+    "generate_coping_strategies": tool_spec(generate_coping_strategies, "🛠️ COPING STRATEGIES")
+}
 
-from langchain_groq import ChatGroq
-
-# Initialize LLM
-llm = ChatGroq(
-    model_name=os.getenv("MODEL_NAME"),
-    api_key=os.getenv("GROQ_API_KEY")
-)
+# Reply when every tool call in a round fails
+THERAPY_FALLBACK_REPLY = "I couldn't prepare that exercise just now. Could you tell me a bit more about what you're experiencing so we can work through it together?"
 
 def therapeutic_agent(state: EnhancedState) -> Command[Literal["coordinator_agent", "__end__"]]:
     """CBT and therapeutic intervention specialist."""
 
-    conversation_messages = []
-    for msg in state.get("messages", []):
-        if hasattr(msg, 'content') and hasattr(msg, 'type'):
-            # LangChain message object
-            conversation_messages.append({
-                "role": "user" if msg.type == "human" else "assistant" if msg.type == "ai" else msg.type,
-                "content": msg.content
-            })
-        elif isinstance(msg, dict) and "role" in msg and "content" in msg:
-            # Already a proper message dict
-            conversation_messages.append(msg)
+    conversation_messages = context_messages("therapeutic_agent", state)
     
     therapy_tools = [
         generate_cbt_exercise,
         mindfulness_exercise_generator,
         generate_coping_strategies
     ]
-    therapy_llm = llm.bind_tools(therapy_tools)
+    therapy_llm = get_tool_llm(therapy_tools)
     
     messages = [
         {"role": "system",
@@ -71,52 +62,36 @@ def therapeutic_agent(state: EnhancedState) -> Command[Literal["coordinator_agen
     
     # Handle therapeutic tool execution
     if response.tool_calls:
-        tool_results = []
-        for tool_call in response.tool_calls:
-            if tool_call["name"] == "generate_cbt_exercise":
-                result = generate_cbt_exercise.invoke({
-                    "issue_type": tool_call["args"]["issue_type"],
-                    "difficulty_level": tool_call["args"].get("difficulty_level", "beginner")
-                })
-                tool_results.append(f"🧠 CBT EXERCISE: {result}")
-
-            elif tool_call["name"] == "mindfulness_exercise_generator":
-                result = mindfulness_exercise_generator.invoke({
-                    "duration": tool_call["args"]["duration"],
-                    "focus_area": tool_call["args"]["focus_area"]
-                })
-                tool_results.append(f"🧘‍♀️ MINDFULNESS: {result}")
-
-            elif tool_call["name"] == "generate_coping_strategies":
-                result = generate_coping_strategies.invoke({
-                    "situation": tool_call["args"]["situation"]
-                })
-                tool_results.append(f"🛠️ COPING STRATEGIES: {result}")
-
+        tool_memo = load_tool_memo(state)
+        tool_results = run_tool_calls(response.tool_calls, THERAPY_TOOL_SPECS, tool_memo)
         
-        if tool_results:
-            final_messages = messages + [response] + [
-                {
-                    "role": "tool",
-                    "content": tool_result,
-                    "tool_call_id": tool_call["id"]
-                }
-                for tool_result, tool_call in zip(tool_results, response.tool_calls)
-            ]
-            final_response = llm.invoke(final_messages)
+        if any(result["ok"] for result in tool_results):
+            final_messages = messages + [response] + tool_messages(tool_results)
+            final_response = get_llm().invoke(final_messages)
             
             return Command(
                 update={
                     "messages": [final_response],
+                    "tool_memo": tool_memo,
                     "current_agent": "therapeutic",
                     "intervention_plan": {
                         "type": "therapeutic_intervention",
-                        "exercises_provided": len(tool_results),
+                        "exercises_provided": sum(result["ok"] for result in tool_results),
                         "focus_areas": [tc["args"].get("issue_type", tc["args"].get("focus_area", "general")) for tc in response.tool_calls]
                     }
                 },
                 goto="__end__"
             )
+
+        # Every call failed: keep the memo counters and don't leave the tool calls unanswered
+        return Command(
+            update={
+                "messages": [failed_round_reply(response, THERAPY_FALLBACK_REPLY)],
+                "tool_memo": tool_memo,
+                "current_agent": "therapeutic"
+            },
+            goto="__end__"
+        )
     
     return Command(
         update={
@@ -2,6 +2,8 @@ from langgraph.types import Command
 from langchain.chat_models import init_chat_model
 from typing import Literal
 from states.enhanced_state import EnhancedState
+from tools.tool_executor import failed_round_reply, run_tool_calls, tool_messages, tool_spec
+from tools.tool_memo import load_tool_memo
 from tools.wellness_tools import (
     generate_wellness_plan,
     sleep_hygiene_assessment,
@@ -10,32 +12,24 @@ from tools.wellness_tools import (
     stress_management_plan
 )
 
-import os
-from dotenv import load_dotenv
+from agents.context_window import context_messages
+from agents.llm_registry import get_llm, get_tool_llm
 
-load_dotenv()
-from langchain_groq import ChatGroq
+WELLNESS_TOOL_SPECS = {
+    "generate_wellness_plan": tool_spec(generate_wellness_plan, "🌟 WELLNESS PLAN"),
+    "sleep_hygiene_assessment": tool_spec(sleep_hygiene_assessment, "😴 SLEEP OPTIMIZATION"),
+    "nutrition_guidance": tool_spec(nutrition_guidance, "🥗 NUTRITION GUIDANCE", {"dietary_restrictions": "none"}),
+    "exercise_recommendations": tool_spec(exercise_recommendations, "💪 EXERCISE PLAN"),
+    "stress_management_plan": tool_spec(stress_management_plan, "🧘 STRESS MANAGEMENT")
+}
 
-# Initialize LLM
-llm = ChatGroq(
-    model_name=os.getenv("MODEL_NAME"),
-    api_key=os.getenv("GROQ_API_KEY")
-)
+# Reply when every tool call in a round fails
+WELLNESS_FALLBACK_REPLY = "I couldn't put that plan together just now. Could you tell me a bit more about your routine so we can try again?"
 
 def wellness_coach_agent(state: EnhancedState) -> Command[Literal["coordinator_agent", "__end__"]]:
     """Focuses on lifestyle, wellness, and preventive mental health."""
 
-    conversation_messages = []
-    for msg in state.get("messages", []):
-        if hasattr(msg, 'content') and hasattr(msg, 'type'):
-            # LangChain message object
-            conversation_messages.append({
-                "role": "user" if msg.type == "human" else "assistant" if msg.type == "ai" else msg.type,
-                "content": msg.content
-            })
-        elif isinstance(msg, dict) and "role" in msg and "content" in msg:
-            # Already a proper message dict
-            conversation_messages.append(msg)
+    conversation_messages = context_messages("wellness_coach_agent", state)
     
     wellness_tools = [
         generate_wellness_plan,
@@ -44,7 +38,7 @@ def wellness_coach_agent(state: EnhancedState) -> Command[Literal["coordinator_a
         exercise_recommendations,
         stress_management_plan,
     ]
-    wellness_llm = llm.bind_tools(wellness_tools)
+    wellness_llm = get_tool_llm(wellness_tools)
     
     messages = [
         {"role": "system",
@@ -78,75 +72,36 @@ def wellness_coach_agent(state: EnhancedState) -> Command[Literal["coordinator_a
 
     # Handle wellness tool execution
     if response.tool_calls:
-        tool_results = []
-        for tool_call in response.tool_calls:
-            if tool_call["name"] == "generate_wellness_plan":
-                preferences = tool_call["args"]["user_preferences"]
-                mood = tool_call["args"]["current_mood"]
-                result = generate_wellness_plan.invoke({"user_preferences": preferences, "current_mood": mood})
-                print(result)
-                tool_results.append(f"🌟 WELLNESS PLAN: {result}")
-                
-            elif tool_call["name"] == "sleep_hygiene_assessment":
-
-                sleep_issues = tool_call["args"]["sleep_issues"]
-                result = sleep_hygiene_assessment.invoke({"sleep_issues": sleep_issues})
-                tool_results.append(f"😴 SLEEP OPTIMIZATION: {result}")
-                
-            elif tool_call["name"] == "nutrition_guidance":
-                goals = tool_call["args"]["nutrition_goals"]
-                restrictions = tool_call["args"].get("dietary_restrictions", "none")
-                result = nutrition_guidance.invoke({
-                        "nutrition_goals": goals,                  # Use the exact parameter name as in tool definition
-                        "dietary_restrictions": restrictions
-                    })
-
-                tool_results.append(f"🥗 NUTRITION GUIDANCE: {result}")
-                
-            elif tool_call["name"] == "exercise_recommendations":
-                fitness_level = tool_call["args"]["fitness_level"]
-                preferences = tool_call["args"]["exercise_preferences"]
-                result = exercise_recommendations.invoke({
-                    "fitness_level": fitness_level,            # Use the exact parameter name
-                    "exercise_preferences": preferences
-                })
-
-                tool_results.append(f"💪 EXERCISE PLAN: {result}")
-                
-            elif tool_call["name"] == "stress_management_plan":
-                stressors = tool_call["args"]["main_stressors"]
-                lifestyle = tool_call["args"]["lifestyle_factors"]
-                result = stress_management_plan.invoke({
-                        "main_stressors": stressors,               # Use the exact parameter name
-                        "lifestyle_factors": lifestyle
-                    })
-
-                tool_results.append(f"🧘 STRESS MANAGEMENT: {result}")
+        tool_memo = load_tool_memo(state)
+        tool_results = run_tool_calls(response.tool_calls, WELLNESS_TOOL_SPECS, tool_memo)
         
-        if tool_results:
-            final_messages = messages + [response] + [
-                {
-                    "role": "tool",
-                    "content": tool_result,
-                    "tool_call_id": tool_call["id"]
-                }
-                for tool_result, tool_call in zip(tool_results, response.tool_calls)
-            ]
-            final_response = llm.invoke(final_messages)
+        if any(result["ok"] for result in tool_results):
+            final_messages = messages + [response] + tool_messages(tool_results)
+            final_response = get_llm().invoke(final_messages)
 
             print("Final_response worked")
             
             return Command(
                 update={
                     "messages": [final_response],
+                    "tool_memo": tool_memo,
                     "current_agent": "wellness_coach",
                     "intervention_plan": {
                         "type": "wellness_coaching",
-                        "plans_created": len(tool_results),
+                        "plans_created": sum(result["ok"] for result in tool_results),
                         "focus_areas": [tc["args"].get("user_preferences", tc["args"].get("nutrition_goals", "general")) for tc in response.tool_calls]
                     }
                 }
             )
+
+        # Every call failed: keep the memo counters and don't leave the tool calls unanswered
+        return Command(
+            update={
+                "messages": [failed_round_reply(response, WELLNESS_FALLBACK_REPLY)],
+                "tool_memo": tool_memo,
+                "current_agent": "wellness_coach"
+            }
+        )
         
     print("Wellness agent run successfully.")
     print("Here's the response: ", response)
@@ -53,9 +53,19 @@ if st.session_state.session_active:
             "content": user_input
         })
 
+        def show_crisis_resources(resources):
+            # Shown as soon as intake's crisis screening fires, before the full reply
+            crisis_message = f"**(crisis)**: {resources}"
+            st.chat_message("assistant").markdown(crisis_message)
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": crisis_message
+            })
+
         try:
             result = st.session_state.runner.process_message(
-                st.session_state.session_id, user_input
+                st.session_state.session_id, user_input,
+                on_crisis_resources=show_crisis_resources
             )
             print("Runner result:", result)  # Debug print
 
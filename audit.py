@@ -0,0 +1,282 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import Counter, OrderedDict
+from contextlib import nullcontext
+from itertools import islice
+from multiprocessing import Pool
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from tools.crisis_matcher import crisis_matcher, fold_risk, is_echo, rolling_level
+
+def open_transcript(path: str) -> ContextManager[TextIO]:
+    """Open a transcript file for reading; '-' is stdin and .gz files are decompressed."""
+    if path == "-":
+        # Leave stdin open when the with block ends
+        return nullcontext(sys.stdin)
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+def read_chunks(paths: List[str], chunk_size: int) -> Iterator[List[str]]:
+    """Yield lists of raw JSONL lines so only a few chunks are ever in memory."""
+    for path in paths:
+        with open_transcript(path) as f:
+            while True:
+                chunk = list(islice(f, chunk_size))
+                if not chunk:
+                    break
+                yield chunk
+
+def bounded(chunks: Iterator[List[str]], slots: threading.Semaphore) -> Iterator[List[str]]:
+    """Hold back chunks until a slot frees up; Pool.imap would otherwise read the whole input ahead."""
+    for chunk in chunks:
+        slots.acquire()
+        yield chunk
+
+def _valid_session_id(session_id: Any) -> bool:
+    return session_id is None or isinstance(session_id, (str, int))
+
+def _records(line: str) -> Tuple[List[Dict[str, Any]], int]:
+    """Expand one JSONL line into message records plus a count of malformed entries.
+
+    A line is either one message ({"session_id", "role", "content", ...}) or a
+    whole session ({"session_id", "messages": [...]}). Anything that isn't a
+    JSON object with a usable session id, including non-object entries in
+    "messages", is counted as malformed instead.
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict) or not _valid_session_id(data.get("session_id")):
+        return [], 1
+    if "messages" not in data:
+        return [data], 0
+
+    messages = data["messages"]
+    if not isinstance(messages, list):
+        return [], 1
+    records = [
+        {"session_id": data.get("session_id"), **message}
+        for message in messages
+        if isinstance(message, dict) and _valid_session_id(message.get("session_id", data.get("session_id")))
+    ]
+    return records, len(messages) - len(records)
+
+def _stub(record: Dict[str, Any]) -> Dict[str, str]:
+    """Role plus a content digest: enough for is_echo without keeping message text."""
+    content = str(record.get("content", ""))
+    return {"role": record.get("role"), "content": hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()}
+
+def score_chunk(lines: List[str]) -> List[Dict[str, Any]]:
+    """Parse and score one chunk of transcript lines (runs in a worker process).
+
+    Intake echoes (a user message repeated right after itself) are skipped
+    as in the live score. A session's first user message in the chunk
+    carries a stub so the parent can check it against the session's last
+    message in earlier chunks, and a final entry lists each session's last
+    message in this chunk.
+    """
+    records = []
+    malformed = 0
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            line_records, line_malformed = _records(line)
+        except ValueError:
+            malformed += 1
+            continue
+        records.extend(line_records)
+        malformed += line_malformed
+
+    user_records = []
+    first_stubs = []
+    echoes = 0
+    tails: Dict[Any, Dict[str, str]] = {}
+    for record in records:
+        stub = _stub(record)
+        session_id = record.get("session_id")
+        previous = tails.get(session_id)
+        tails[session_id] = stub
+        if record.get("role") != "user":
+            continue
+        if previous is not None and is_echo([previous, stub], 1):
+            echoes += 1
+            continue
+        user_records.append(record)
+        first_stubs.append(stub if previous is None else None)
+
+    scores = crisis_matcher.score_batch(str(record.get("content", "")) for record in user_records)
+
+    results = []
+    for record, score, first_stub in zip(user_records, scores, first_stubs):
+        result = {
+            "session_id": record.get("session_id"),
+            "timestamp": record.get("timestamp"),
+            "risk_level": score["risk_level"],
+            "indicators": score["high_risk_indicators"] + score["medium_risk_indicators"]
+        }
+        if first_stub is not None:
+            result["first_stub"] = first_stub
+        results.append(result)
+
+    if malformed:
+        results.append({"malformed": malformed})
+    if echoes:
+        results.append({"echoes": echoes})
+    results.append({"tails": tails})
+    return results
+
+def audit(
+    paths: List[str],
+    timeline: Optional[TextIO],
+    workers: int,
+    chunk_size: int,
+    threshold: int,
+    decay: float,
+    max_sessions: int = 100000,
+    max_listed_ids: int = 1000
+) -> Dict[str, Any]:
+    """Score every user message and return summary statistics.
+
+    Each scored message is written to `timeline` with the session's rolling
+    crisis level at that point (same decay and echo skipping as the live
+    rolling score).
+    Memory use is bounded by a few chunks, the state of the `max_sessions`
+    most recently seen sessions and `max_listed_ids` listed session ids.
+    A session not seen for longer than that is closed; if it shows up again
+    its rolling level starts over and it is counted as a new session. Counts
+    stay exact even when the id lists are cut off.
+    """
+    sessions: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+    risk_histogram: Counter = Counter()
+    totals = Counter()
+    flagged_ids: List[str] = []
+    accumulated_ids: List[str] = []
+    messages = 0
+    malformed = 0
+    echoes = 0
+
+    def close_session(session_id: Any, session: Dict[str, Any]) -> None:
+        totals["sessions"] += 1
+        if session["first_flagged_at"] is None:
+            return
+        totals["flagged"] += 1
+        if len(flagged_ids) < max_listed_ids:
+            flagged_ids.append(str(session_id))
+        # Sessions that reached the threshold only through accumulated risk are the ones per-message screening misses
+        if session["max_risk"] < threshold:
+            totals["accumulated_only"] += 1
+            if len(accumulated_ids) < max_listed_ids:
+                accumulated_ids.append(str(session_id))
+
+    # At most two chunks per worker are read ahead of the results being consumed
+    slots = threading.Semaphore(workers * 2)
+
+    with Pool(workers) as pool:
+        for results in pool.imap(score_chunk, bounded(read_chunks(paths, chunk_size), slots)):
+            slots.release()
+            for result in results:
+                if "malformed" in result:
+                    malformed += result["malformed"]
+                    continue
+                if "echoes" in result:
+                    echoes += result["echoes"]
+                    continue
+                if "tails" in result:
+                    # Only sessions already tracked can have an echo across chunks
+                    for session_id, stub in result["tails"].items():
+                        if session_id in sessions:
+                            sessions[session_id]["tail"] = stub
+                    continue
+
+                session = sessions.get(result["session_id"])
+                if session is not None and "first_stub" in result and session["tail"] is not None and is_echo([session["tail"], result["first_stub"]], 1):
+                    echoes += 1
+                    continue
+
+                if session is None:
+                    session = sessions[result["session_id"]] = {
+                        "messages": 0, "aggregate": 0.0, "max_risk": 0, "max_rolling": 0, "first_flagged_at": None, "tail": None
+                    }
+                    if len(sessions) > max_sessions:
+                        close_session(*sessions.popitem(last=False))
+                        totals["evicted"] += 1
+                else:
+                    sessions.move_to_end(result["session_id"])
+
+                session["aggregate"] = fold_risk(session["aggregate"], result["risk_level"], decay)
+                rolling = rolling_level(session["aggregate"])
+
+                session["messages"] += 1
+                session["max_risk"] = max(session["max_risk"], result["risk_level"])
+                session["max_rolling"] = max(session["max_rolling"], rolling)
+                if rolling >= threshold and session["first_flagged_at"] is None:
+                    session["first_flagged_at"] = session["messages"]
+
+                messages += 1
+                risk_histogram[result["risk_level"]] += 1
+
+                if timeline is not None:
+                    timeline.write(json.dumps({
+                        "session_id": result["session_id"],
+                        "index": session["messages"],
+                        "timestamp": result["timestamp"],
+                        "risk_level": result["risk_level"],
+                        "rolling_level": rolling,
+                        "indicators": result["indicators"]
+                    }) + "\n")
+
+    while sessions:
+        close_session(*sessions.popitem(last=False))
+
+    return {
+        "messages_scored": messages,
+        "malformed_records": malformed,
+        "echoes_skipped": echoes,
+        "sessions": totals["sessions"],
+        "sessions_closed_early": totals["evicted"],
+        "sessions_flagged": totals["flagged"],
+        "sessions_flagged_by_accumulated_risk": totals["accumulated_only"],
+        "flagged_session_ids": sorted(flagged_ids),
+        "accumulated_risk_session_ids": sorted(accumulated_ids),
+        "risk_level_histogram": {str(level): count for level, count in sorted(risk_histogram.items())}
+    }
+
+def main():
+    """Crisis audit entry point for archived JSONL transcripts."""
+    
+    parser = argparse.ArgumentParser(description="Re-score archived conversations for crisis risk.")
+    parser.add_argument("transcripts", nargs="+", help="JSONL transcript files (.jsonl or .jsonl.gz, '-' for stdin)")
+    parser.add_argument("--timeline", help="write per-message risk timelines to this JSONL file")
+    parser.add_argument("--summary", help="write summary statistics to this JSON file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="lines per worker task")
+    parser.add_argument("--threshold", type=int, default=8, help="rolling crisis level that flags a session")
+    parser.add_argument("--decay", type=float, default=0.5, help="rolling score decay per user message")
+    parser.add_argument("--max-sessions", type=int, default=100000, help="sessions whose rolling state is kept at once")
+    parser.add_argument("--max-listed-ids", type=int, default=1000, help="session ids listed per category in the summary")
+    args = parser.parse_args()
+    
+    timeline = open(args.timeline, "w", encoding="utf-8") if args.timeline else None
+    try:
+        summary = audit(
+            args.transcripts, timeline, args.workers, args.chunk_size, args.threshold, args.decay,
+            args.max_sessions, args.max_listed_ids
+        )
+    finally:
+        if timeline is not None:
+            timeline.close()
+    
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    else:
+        print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
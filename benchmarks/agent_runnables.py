@@ -0,0 +1,99 @@
+"""Per-turn overhead of preparing the agents' LLM runnables.
+
+Compares rebuilding `bind_tools` / `with_structured_output` runnables on
+every agent call (the old behavior) with fetching them from the shared LLM
+registry. No requests are sent to the provider.
+
+    python benchmarks/agent_runnables.py --turns 200
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Building clients needs a key and model name, but nothing is sent
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+os.environ.setdefault("MODEL_NAME", "llama-3.3-70b-versatile")
+
+from agents.coordinator_agent import AgentRouter
+from agents.intake_agent import IntakeAssessment
+from agents.llm_registry import LLMRegistry
+from tools import (
+    assess_crisis_level,
+    find_crisis_resources,
+    create_safety_plan,
+    generate_cbt_exercise,
+    mindfulness_exercise_generator,
+    generate_coping_strategies,
+    find_support_groups,
+    find_therapists,
+    search_mental_health_resources,
+    insurance_navigator,
+    mental_health_education,
+    medication_information,
+    generate_wellness_plan,
+    sleep_hygiene_assessment,
+    nutrition_guidance,
+    exercise_recommendations,
+    stress_management_plan
+)
+
+# The toolsets and schemas each agent prepares on a call
+TOOLSETS: List[List[Any]] = [
+    [assess_crisis_level],
+    [find_crisis_resources, create_safety_plan],
+    [generate_cbt_exercise, mindfulness_exercise_generator, generate_coping_strategies],
+    [find_support_groups, find_therapists, search_mental_health_resources, insurance_navigator, mental_health_education, medication_information],
+    [generate_wellness_plan, sleep_hygiene_assessment, nutrition_guidance, exercise_recommendations, stress_management_plan],
+]
+SCHEMAS = [IntakeAssessment, AgentRouter]
+
+def rebuild_turn(registry: LLMRegistry) -> None:
+    """Prepare every runnable from scratch, as each agent call used to."""
+    llm = registry.get()
+    for tools in TOOLSETS:
+        llm.bind_tools(tools)
+    for schema in SCHEMAS:
+        llm.with_structured_output(schema)
+
+def cached_turn(registry: LLMRegistry) -> None:
+    """Fetch every runnable from the registry."""
+    for tools in TOOLSETS:
+        registry.with_tools(tools)
+    for schema in SCHEMAS:
+        registry.with_structured_output(schema)
+
+def time_turns(turn: Callable[[LLMRegistry], None], registry: LLMRegistry, turns: int) -> Tuple[float, float]:
+    """Return (first turn, mean of the remaining turns) in milliseconds."""
+    start = time.perf_counter()
+    turn(registry)
+    first = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(turns - 1):
+        turn(registry)
+    rest = (time.perf_counter() - start) * 1000 / max(1, turns - 1)
+    return first, rest
+
+def main():
+    """Runnable preparation micro-benchmark entry point."""
+    
+    parser = argparse.ArgumentParser(description="Measure per-turn runnable preparation overhead.")
+    parser.add_argument("--turns", type=int, default=200, help="simulated turns (each prepares every agent's runnables)")
+    args = parser.parse_args()
+    
+    rows = [
+        ("rebuild per call", *time_turns(rebuild_turn, LLMRegistry(), args.turns)),
+        ("registry cached", *time_turns(cached_turn, LLMRegistry(), args.turns)),
+    ]
+    
+    print(f"{'strategy':<18}{'first turn (ms)':>18}{'per turn (ms)':>16}")
+    for name, first, rest in rows:
+        print(f"{name:<18}{first:>18.3f}{rest:>16.4f}")
+    print(f"speedup per turn: {rows[0][2] / rows[1][2]:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Per-turn cost of converting state messages for the agents over a long session.
+
+Each simulated turn appends a user and an assistant message and then
+converts the history once per agent node that runs in a turn, first with
+the old full re-walk and then with the shared incremental normalizer.
+
+    python benchmarks/message_normalization.py --turns 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agents.message_normalizer import MessageNormalizer, convert_message
+
+def rewalk(messages: List[Any]) -> List[Dict[str, Any]]:
+    """The conversion loop every agent used to run over the whole history."""
+    converted = []
+    for msg in messages:
+        item = convert_message(msg)
+        if item is not None:
+            converted.append(item)
+    return converted
+
+def main():
+    """Long-session message normalization benchmark entry point."""
+    
+    parser = argparse.ArgumentParser(description="Measure per-turn message conversion cost as a session grows.")
+    parser.add_argument("--turns", type=int, default=2000, help="user/assistant exchanges in the session")
+    parser.add_argument("--nodes", type=int, default=3, help="agent nodes that convert the history per turn")
+    parser.add_argument("--report-every", type=int, default=250, help="print a row every this many turns")
+    args = parser.parse_args()
+    
+    normalizer = MessageNormalizer()
+    messages: List[Any] = []
+    
+    print(f"{'turn':>6}{'history':>9}{'re-walk (us)':>15}{'incremental (us)':>19}")
+    for turn in range(1, args.turns + 1):
+        messages.append(HumanMessage(content=f"How do I handle stress at work? (turn {turn})", id=str(uuid.uuid4())))
+        messages.append(AIMessage(content=f"Here are a few strategies you could try. (turn {turn})", id=str(uuid.uuid4())))
+        
+        start = time.perf_counter()
+        for _ in range(args.nodes):
+            rewalk(messages)
+        rewalk_us = (time.perf_counter() - start) * 1e6
+        
+        start = time.perf_counter()
+        for _ in range(args.nodes):
+            normalizer.normalize(messages)
+        incremental_us = (time.perf_counter() - start) * 1e6
+        
+        if turn == 1 or turn % args.report_every == 0:
+            print(f"{turn:>6}{len(messages):>9}{rewalk_us:>15.1f}{incremental_us:>19.1f}")
+    
+    assert normalizer.normalize(messages) == rewalk(messages)
+    print(normalizer.stats())
+
+if __name__ == "__main__":
+    main()
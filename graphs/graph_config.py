@@ -8,13 +8,29 @@ class GraphConfig:
         self.llm_config = {
             "model": "anthropic:claude-3-5-sonnet-latest",
             "temperature": 0.1,
-            "max_tokens": 1000
+            "max_tokens": 1000,
+            # Approx. prompt tokens of conversation history (rolling summary included)
+            # each agent sends; the system prompt is not counted
+            "context_budgets": {
+                "intake_agent": 1500,
+                "crisis_agent": 3000,
+                "therapeutic_agent": 2500,
+                "resource_coordinator_agent": 2000,
+                "wellness_coach_agent": 2000
+            },
+            "default_context_budget": 2000,
+            "recent_turns": 6,  # user turns always kept verbatim (budget permitting)
+            "summary_trigger_messages": 8,  # older messages that accumulate before the summary is refreshed
+            "summary_max_tokens": 300
         }
         
         self.crisis_config = {
             "high_risk_threshold": 8,
             "immediate_intervention_threshold": 9,
-            "safety_plan_threshold": 6
+            "safety_plan_threshold": 6,
+            # Rolling conversation score: each user message's risk is added to
+            # the previous aggregate multiplied by rolling_decay
+            "rolling_decay": 0.5
         }
         
         self.session_config = {
@@ -29,6 +45,18 @@ class GraphConfig:
             "allow_agent_loops": True,
             "max_loops": 3
         }
+        
+        self.warmup_config = {
+            "enabled": True,
+            # Crisis lookups for these locations are prefetched into the search cache
+            "locations": [
+                "New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX", "Phoenix, AZ",
+                "Philadelphia, PA", "San Antonio, TX", "San Diego, CA", "Dallas, TX", "Jacksonville, FL"
+            ],
+            "crisis_types": ["general"],
+            "interval_seconds": 6 * 60 * 60,  # refresh well within the 24h crisis cache TTL
+            "pace_seconds": 1.0  # gap between warm-up searches
+        }
     
     def get_config(self) -> Dict[str, Any]:
         """Get complete configuration dictionary."""
@@ -36,7 +64,8 @@ class GraphConfig:
             "llm": self.llm_config,
             "crisis": self.crisis_config,
             "session": self.session_config,
-            "routing": self.routing_config
+            "routing": self.routing_config,
+            "warmup": self.warmup_config
         }
 
 def load_graph_config() -> GraphConfig:
@@ -47,7 +76,28 @@ def load_graph_config() -> GraphConfig:
     if os.getenv("LLM_TEMPERATURE"):
         config.llm_config["temperature"] = float(os.getenv("LLM_TEMPERATURE"))
     
+    if os.getenv("CONTEXT_RECENT_TURNS"):
+        config.llm_config["recent_turns"] = int(os.getenv("CONTEXT_RECENT_TURNS"))
+    
+    if os.getenv("CONTEXT_TOKEN_BUDGET"):
+        config.llm_config["default_context_budget"] = int(os.getenv("CONTEXT_TOKEN_BUDGET"))
+    
     if os.getenv("CRISIS_THRESHOLD"):
         config.crisis_config["high_risk_threshold"] = int(os.getenv("CRISIS_THRESHOLD"))
     
+    if os.getenv("SEARCH_WARMUP_ENABLED"):
+        config.warmup_config["enabled"] = os.getenv("SEARCH_WARMUP_ENABLED").lower() in ("1", "true", "yes")
+    
+    if os.getenv("SEARCH_WARMUP_LOCATIONS"):
+        config.warmup_config["locations"] = [loc.strip() for loc in os.getenv("SEARCH_WARMUP_LOCATIONS").split(";") if loc.strip()]
+    
+    if os.getenv("SEARCH_WARMUP_CRISIS_TYPES"):
+        config.warmup_config["crisis_types"] = [t.strip() for t in os.getenv("SEARCH_WARMUP_CRISIS_TYPES").split(",") if t.strip()]
+    
+    if os.getenv("SEARCH_WARMUP_INTERVAL"):
+        config.warmup_config["interval_seconds"] = float(os.getenv("SEARCH_WARMUP_INTERVAL"))
+    
+    if os.getenv("SEARCH_WARMUP_PACE"):
+        config.warmup_config["pace_seconds"] = float(os.getenv("SEARCH_WARMUP_PACE"))
+    
     return config
@@ -1,9 +1,13 @@
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 import uuid
 from datetime import datetime
+from agents.context_window import get_context_window
 from graphs.main_graph import build_mental_health_graph
 from graphs.graph_config import load_graph_config
 from states.enhanced_state import EnhancedState
+from tools.search_limits import get_search_limiter
+from tools.search_warmup import start_search_warmup
+from tools.tool_memo import tool_memo_stats
 
 class MentalHealthGraphRunner:
     """Runner class for the mental health support graph."""
@@ -12,6 +16,11 @@ class MentalHealthGraphRunner:
         self.config = load_graph_config()
         self.graph = build_mental_health_graph()
         self.active_sessions: Dict[str, Dict[str, Any]] = {}
+        
+        # Prefetch crisis lookups so the first crisis user doesn't wait on the network
+        warmup = self.config.warmup_config
+        if warmup["enabled"]:
+            start_search_warmup(warmup["locations"], warmup["crisis_types"], warmup["interval_seconds"], warmup["pace_seconds"])
     
     def start_session(self, user_id: Optional[str] = None) -> str:
         """Start a new mental health support session."""
@@ -26,11 +35,13 @@ class MentalHealthGraphRunner:
                 "agent_switches": 0
             },
             "crisis_level": None,
+            "crisis_score": None,
             "safety_plan_active": False,
             "current_agent": None,
             "agent_history": [],
             "intervention_plan": None,
             "tools_used": [],
+            "tool_memo": None,
             "session_id": session_id,
             "session_start_time": datetime.now().isoformat(),
             "continue_session": True,
@@ -42,8 +53,18 @@ class MentalHealthGraphRunner:
         self.active_sessions[session_id] = initial_state
         return session_id
     
-    def process_message(self, session_id: str, user_message: str) -> Dict[str, Any]:
-        """Process a user message through the graph."""
+    def process_message(
+        self,
+        session_id: str,
+        user_message: str,
+        on_crisis_resources: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """Process a user message through the graph.
+
+        If intake's crisis screening fires, `on_crisis_resources` is called with
+        the crisis resources as soon as they are ready, before the crisis
+        agent's reply is generated.
+        """
         
         if session_id not in self.active_sessions:
             raise ValueError(f"Session {session_id} not found")
@@ -61,7 +82,17 @@ class MentalHealthGraphRunner:
         # Process through graph
         try:
 
-            result = self.graph.invoke(state)
+            # Scope web search budgets to this session and turn
+            with get_search_limiter().turn(session_id):
+                result = self._run_graph(state, on_crisis_resources)
+            
+            # Fold older turns into the rolling summary in the background; the
+            # latest finished summary is kept with the session
+            context_window = get_context_window()
+            context_window.schedule_refresh(session_id, result)
+            summary = context_window.summary_for(result)
+            if summary is not None:
+                result["session_context"] = {**(result.get("session_context") or {}), "conversation_summary": summary}
             self.active_sessions[session_id] = result
             
             # Extract assistant response
@@ -73,6 +104,7 @@ class MentalHealthGraphRunner:
             return {
                 "session_id": session_id,
                 "response": assistant_response,
+                "crisis_resources": (result.get("session_context") or {}).get("crisis_resources"),
                 "current_agent": result.get("current_agent"),
                 "crisis_level": result.get("crisis_level"),
                 "session_active": result.get("continue_session", True),
@@ -93,6 +125,25 @@ class MentalHealthGraphRunner:
             }
             return error_response
     
+    def _run_graph(self, state: Dict[str, Any], on_crisis_resources: Optional[Callable[[str], None]]) -> Dict[str, Any]:
+        """Run the graph to completion, reporting intake's crisis resources as soon as they appear."""
+        
+        if on_crisis_resources is None:
+            return self.graph.invoke(state)
+        
+        result = state
+        for mode, chunk in self.graph.stream(state, stream_mode=["updates", "values"]):
+            if mode == "values":
+                result = chunk
+                continue
+            
+            intake_update = chunk.get("intake_agent") or {}
+            crisis_resources = (intake_update.get("session_context") or {}).get("crisis_resources")
+            if crisis_resources:
+                on_crisis_resources(crisis_resources)
+        
+        return result
+    
     def end_session(self, session_id: str) -> Dict[str, Any]:
         """Manually end a session."""
         return self._end_session(session_id)
@@ -112,6 +163,7 @@ class MentalHealthGraphRunner:
             "crisis_level": state.get("crisis_level"),
             "interventions": state.get("intervention_plan"),
             "tools_used": state.get("tools_used", []),
+            "tool_memo": tool_memo_stats(state.get("tool_memo")),
             "referrals_made": state.get("referrals_made", []),
             "message_count": len(state.get("messages", [])),
             "session_outcomes": state.get("session_outcomes")
@@ -138,6 +190,8 @@ class MentalHealthGraphRunner:
         
         # Clean up session
         del self.active_sessions[session_id]
+        get_search_limiter().end_session(session_id)
+        get_context_window().end_session(session_id)
         
         return {
             "session_id": session_id,
@@ -13,6 +13,7 @@ from agents.coordinator_agent import coordinator_agent
 
 # Import state
 from states.enhanced_state import EnhancedState
+from tools.crisis_matcher import effective_crisis_level
 
 def build_mental_health_graph():
     """Build and return the complete mental health support graph."""
@@ -112,9 +113,9 @@ def build_mental_health_graph():
 def determine_next_agent(state: EnhancedState) -> str:
     """Determine next agent based on coordinator's routing decision."""
     
-    # Check for crisis override
-    crisis_level = state.get("crisis_level", 0)
-    if crisis_level and crisis_level >= 8:
+    # Check for crisis override, including risk built up over the conversation
+    crisis_level = effective_crisis_level(state)
+    if crisis_level >= 8:
         return "crisis_agent"
     
     # Check current agent recommendation from coordinator
@@ -37,7 +37,11 @@ def main():
                     break
                 
                 # Process message
-                result = runner.process_message(session_id, user_input)
+                result = runner.process_message(
+                    session_id,
+                    user_input,
+                    on_crisis_resources=lambda resources: print(f"\nAssistant (crisis): {resources}")
+                )
                 
                 # Display response
                 print(f"\nAssistant ({result.get('current_agent', 'system')}): {result['response']}")
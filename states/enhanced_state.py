@@ -14,6 +14,7 @@ class EnhancedState(TypedDict):
     
     # Crisis and safety tracking
     crisis_level: Optional[int]  # 1-10 scale
+    crisis_score: Optional[Dict[str, Any]]  # rolling conversation-level score, see tools.crisis_matcher
     safety_plan_active: Optional[bool]
     
     # Agent coordination
@@ -23,6 +24,7 @@ class EnhancedState(TypedDict):
     # Intervention tracking
     intervention_plan: Optional[Dict[str, Any]]
     tools_used: Optional[List[str]]
+    tool_memo: Optional[Dict[str, Any]]  # session-scoped tool results, see tools.tool_memo
     
     # Session management
     session_id: Optional[str]
@@ -0,0 +1,41 @@
+from tools.crisis_matcher import crisis_matcher, update_crisis_score
+
+def _user(content, message_id):
+    return {"role": "user", "content": content, "id": message_id}
+
+def test_each_user_message_is_scored_once():
+    messages = [_user("I feel hopeless", "1")]
+    crisis_score = update_crisis_score(None, messages)
+    messages.append({"role": "assistant", "content": "I'm here for you", "id": "2"})
+    assert update_crisis_score(crisis_score, messages)["aggregate"] == crisis_score["aggregate"]
+
+def test_intake_echo_is_not_scored_again():
+    messages = [_user("I feel hopeless", "1")]
+    crisis_score = update_crisis_score(None, messages)
+    # Intake routes with the latest user message echoed as a new message
+    messages += [_user("I feel hopeless", "2"), {"role": "assistant", "content": "I'm here for you", "id": "3"}]
+    assert update_crisis_score(crisis_score, messages)["aggregate"] == crisis_score["aggregate"]
+
+def test_negated_keyword_is_ignored():
+    assert crisis_matcher.score("I don't want to die")["risk_level"] == 0
+
+def test_negation_stops_at_clause_boundary():
+    assert crisis_matcher.match("I'm not sleeping but I want to die")["high"] == ["want to die"]
+
+def test_contrast_takes_back_a_denial():
+    assert crisis_matcher.score("I didn't think I'd want to die but I do")["risk_level"] > 0
+
+def test_repeated_risk_reaches_high_risk_level():
+    messages = []
+    crisis_score = None
+    for turn in range(5):
+        messages += [_user("I want to die", f"user-{turn}"), {"role": "assistant", "content": "I'm here for you", "id": f"ai-{turn}"}]
+        crisis_score = update_crisis_score(crisis_score, messages)
+    # Same risk every message settles at twice that risk with decay 0.5
+    assert crisis_score["level"] >= 8
+
+def test_latest_is_reset_without_new_user_messages():
+    messages = [_user("I want to die", "1")]
+    crisis_score = update_crisis_score(None, messages)
+    messages.append({"role": "assistant", "content": "I'm here for you", "id": "2"})
+    assert update_crisis_score(crisis_score, messages)["latest"] == 0
@@ -0,0 +1,11 @@
+from tools.formulary import get_formulary, local_medication_information
+
+def test_typo_is_shown_under_the_matched_medication():
+    assert local_medication_information("prozak").startswith("Showing results for fluoxetine")
+
+def test_name_inside_a_longer_name_is_not_a_typo():
+    # "ketamine" is a different drug from esketamine
+    assert get_formulary().lookup("ketamine") is None
+
+def test_dropped_letter_is_a_typo():
+    assert local_medication_information("adderal").startswith("Showing results for")
@@ -0,0 +1,41 @@
+import threading
+
+from agents import llm_registry
+from agents.llm_registry import LLMRegistry
+
+class FakeChat:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def bind_tools(self, tools):
+        return ("tools", tuple(tools))
+
+    def with_structured_output(self, schema):
+        return ("structured", schema)
+
+class FakeTool:
+    name = "fake_tool"
+
+TOOL = FakeTool()
+
+def _returns_within(fn, timeout=5.0):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return result
+
+def test_prepared_runnables_return_on_a_fresh_registry(monkeypatch):
+    monkeypatch.setattr(llm_registry, "ChatGroq", FakeChat)
+
+    registry = LLMRegistry()
+    assert _returns_within(lambda: registry.with_tools([TOOL], "model")) == [("tools", (TOOL,))]
+
+    registry = LLMRegistry()
+    assert _returns_within(lambda: registry.with_structured_output(dict, "model")) == [("structured", dict)]
+
+def test_prepared_runnables_are_reused(monkeypatch):
+    monkeypatch.setattr(llm_registry, "ChatGroq", FakeChat)
+
+    registry = LLMRegistry()
+    assert registry.with_tools([TOOL], "model") is registry.with_tools([TOOL], "model")
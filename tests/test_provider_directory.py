@@ -0,0 +1,15 @@
+from tools.provider_directory import parse_location
+
+def test_every_state_code_is_recognized():
+    assert parse_location("Buffalo, NY") == {"city": "buffalo", "state": "ny"}
+    assert parse_location("Seattle, WA") == {"city": "seattle", "state": "wa"}
+    assert parse_location("Washington DC") == {"city": "washington", "state": "dc"}
+
+def test_zip_codes():
+    assert parse_location("02139") == {"zip_prefix": "02139"}
+    assert parse_location("021") == {"zip_prefix": "021"}
+    assert parse_location("Cambridge, MA 02139-1234") == {"zip_prefix": "02139"}
+
+def test_other_numbers_are_not_zip_codes():
+    assert parse_location("Apt 123, Boston") == {"city": "boston"}
+    assert parse_location("12 Main St, Cambridge, MA") == {"city": "cambridge", "state": "ma"}
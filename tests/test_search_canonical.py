@@ -0,0 +1,32 @@
+from tools.search_canonical import canonicalize_query
+
+def test_spelled_out_state_matches_postal_code():
+    assert canonicalize_query("Austin, Texas therapists") == canonicalize_query("therapists Austin TX")
+
+def test_indiana_is_not_dropped_as_stopword():
+    assert canonicalize_query("therapists anxiety Indiana") != canonicalize_query("anxiety therapists")
+
+def test_oregon_is_not_dropped_as_stopword():
+    assert canonicalize_query("support groups Portland Oregon") != canonicalize_query("support groups Portland")
+
+def test_louisiana_does_not_collide_with_los_angeles():
+    assert canonicalize_query("therapists in Louisiana") != canonicalize_query("therapists LA")
+    assert canonicalize_query("therapists in Louisiana") != canonicalize_query("therapists Los Angeles")
+
+def test_us_pronoun_is_not_a_location():
+    assert "united" not in canonicalize_query("help us find therapists").split()
+    assert canonicalize_query("crisis hotlines in the USA") == canonicalize_query("crisis hotlines united states")
+
+def test_new_york_state_matches_postal_code():
+    assert canonicalize_query("therapists Buffalo, New York") == canonicalize_query("therapists Buffalo NY")
+
+def test_new_york_city_is_not_the_state():
+    assert canonicalize_query("therapists NYC") == canonicalize_query("therapists New York, NY")
+    assert canonicalize_query("therapists NYC") != canonicalize_query("therapists New York State")
+
+def test_washington_state_matches_postal_code():
+    assert canonicalize_query("Spokane, Washington") == canonicalize_query("Spokane WA")
+
+def test_washington_dc_is_not_the_state():
+    assert canonicalize_query("Washington DC therapists") == canonicalize_query("District of Columbia therapists")
+    assert canonicalize_query("Washington DC therapists") != canonicalize_query("Washington State therapists")
@@ -0,0 +1,16 @@
+import pytest
+
+from tools.search_limits import SearchBudgetExceeded, SearchLimiter
+
+def test_background_searches_leave_capacity_for_users():
+    limiter = SearchLimiter(rate_per_second=0.001, burst=20, background_reserve=10)
+
+    with limiter.background():
+        for _ in range(10):
+            limiter.acquire()
+        with pytest.raises(SearchBudgetExceeded):
+            limiter.acquire()
+
+    for _ in range(10):
+        limiter.acquire()
+    assert limiter.stats()["rejected"]["background"] == 1
@@ -0,0 +1,18 @@
+from tools.search_results import degraded
+from tools.tool_memo import load_tool_memo, memo_lookup, memo_store
+
+def test_results_are_memoized():
+    memo = load_tool_memo({})
+    memo_store("find_therapists", {"location": "Austin"}, memo, "results")
+    assert memo_lookup("find_therapists", {"location": "Austin"}, memo) == (True, "results")
+
+def test_degraded_fallback_is_not_memoized():
+    memo = load_tool_memo({})
+    memo_store("find_therapists", {"location": "Austin"}, memo, degraded("Unable to search for therapists"))
+    assert memo_lookup("find_therapists", {"location": "Austin"}, memo) == (False, None)
+
+def test_exercise_with_unavailable_sections_is_not_memoized():
+    memo = load_tool_memo({})
+    exercise = {"exercise_guide": "Search results are unavailable right now.", "unavailable_sections": ["exercise_guide"]}
+    memo_store("generate_cbt_exercise", {"issue_type": "anxiety"}, memo, exercise)
+    assert memo_lookup("generate_cbt_exercise", {"issue_type": "anxiety"}, memo) == (False, None)
@@ -0,0 +1,184 @@
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Crisis keywords by severity, with the weight each distinct match adds
+CRISIS_KEYWORDS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "high": (2.0, ("suicide", "kill myself", "end it all", "want to die", "better off dead")),
+    "medium": (1.5, ("self-harm", "hurt myself", "cut myself", "can't go on", "no point")),
+    "low": (1.0, ("hopeless", "worthless", "give up", "tired of living")),
+}
+
+# Words that, shortly before a keyword, turn it into a denial ("I don't want to die")
+NEGATIONS = frozenset([
+    "not", "never", "don't", "dont", "doesn't", "doesnt", "didn't", "didnt",
+    "won't", "wont", "wouldn't", "wouldnt", "isn't", "isnt", "wasn't", "wasnt"
+])
+NEGATION_WINDOW = 3
+
+# A negation only reaches keywords in its own clause; "but" and "yet" start a new one
+_CLAUSE_BREAK = re.compile(r"[.!?;,\n]|\b(?:but|yet)\b")
+_SENTENCE_BREAK = re.compile(r"[.!?\n]")
+_CONTRAST = re.compile(r"\b(?:but|yet)\b")
+_WORD = re.compile(r"[a-z']+")
+
+class CrisisMatcher:
+    """Single-pass crisis keyword matcher built on one precompiled regex.
+
+    Keywords match on word boundaries, and a keyword preceded within the same
+    clause by a negation (see NEGATIONS) is ignored, unless the sentence goes
+    on to contrast it ("I didn't think I'd want to die but I do").
+    """
+
+    def __init__(self, keywords: Dict[str, Tuple[float, Iterable[str]]] = CRISIS_KEYWORDS):
+        self.keywords = {severity: (weight, tuple(terms)) for severity, (weight, terms) in keywords.items()}
+        self._severity: Dict[str, str] = {}
+        self._order: Dict[str, int] = {}
+
+        for severity, (_, terms) in self.keywords.items():
+            for term in terms:
+                self._severity[term] = severity
+                self._order[term] = len(self._order)
+
+        # Longest first so overlapping phrases prefer the more specific match
+        alternatives = sorted(self._severity, key=len, reverse=True)
+        self._pattern = re.compile(r"(?<![\w'-])(?:" + "|".join(re.escape(term) for term in alternatives) + r")(?![\w'-])")
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return text.lower().replace("’", "'")
+
+    @staticmethod
+    def _is_negated(text: str, start: int, end: int) -> bool:
+        clause = _CLAUSE_BREAK.split(text[max(0, start - 80):start])[-1]
+        if not any(word in NEGATIONS for word in _WORD.findall(clause)[-NEGATION_WINDOW:]):
+            return False
+        # A contrast later in the sentence takes the denial back
+        rest = _SENTENCE_BREAK.split(text[end:end + 80])[0]
+        return not _CONTRAST.search(rest)
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """Return the distinct non-negated keywords found in text, grouped by severity."""
+        text = self._normalize(text)
+        found = set()
+
+        for match in self._pattern.finditer(text):
+            term = match.group(0)
+            if term not in found and not self._is_negated(text, match.start(), match.end()):
+                found.add(term)
+
+        matches: Dict[str, List[str]] = {severity: [] for severity in self.keywords}
+        for term in sorted(found, key=self._order.__getitem__):
+            matches[self._severity[term]].append(term)
+        return matches
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """Return the crisis risk assessment for one message."""
+        matches = self.match(text)
+        total_risk_score = sum(self.keywords[severity][0] * len(terms) for severity, terms in matches.items())
+        risk_level = min(int(total_risk_score * 2), 10)
+
+        return {
+            "risk_level": risk_level,
+            "immediate_action_needed": risk_level >= 6,
+            "high_risk_indicators": matches.get("high", []),
+            "medium_risk_indicators": matches.get("medium", []),
+            "recommended_action": "immediate_crisis_intervention" if risk_level >= 8 else "crisis_support" if risk_level >= 6 else "standard_support",
+            "safety_planning_needed": risk_level >= 4
+        }
+
+    def score_batch(self, texts: Iterable[str]) -> List[Dict[str, Any]]:
+        """Score many messages in one call, e.g. when re-screening stored transcripts."""
+        score = self.score
+        return [score(text) for text in texts]
+
+# Shared matcher; the pattern is compiled once at import
+crisis_matcher = CrisisMatcher()
+
+def _is_user_message(message: Any) -> bool:
+    if isinstance(message, dict):
+        return message.get("role") == "user"
+    return getattr(message, "type", None) == "human"
+
+def _message_id(message: Any) -> Optional[str]:
+    if isinstance(message, dict):
+        return message.get("id")
+    return getattr(message, "id", None)
+
+def _message_text(message: Any) -> str:
+    content = message.get("content") if isinstance(message, dict) else getattr(message, "content", "")
+    return content if isinstance(content, str) else str(content)
+
+def _new_messages_start(messages: List[Any], last_seen_id: Optional[str]) -> int:
+    """Index of the first message after the one with last_seen_id, scanning back from the end."""
+    if last_seen_id is None:
+        return 0
+    for index in range(len(messages) - 1, -1, -1):
+        if _message_id(messages[index]) == last_seen_id:
+            return index + 1
+    # The last seen message was trimmed away; everything older was scored already
+    return max(len(messages) - 1, 0)
+
+def is_echo(messages: List[Any], index: int) -> bool:
+    """Whether a user message repeats the user message right before it (intake echoes the latest one)."""
+    if index == 0 or not _is_user_message(messages[index - 1]):
+        return False
+    return _message_text(messages[index - 1]) == _message_text(messages[index])
+
+def fold_risk(aggregate: float, risk: int, decay: float) -> float:
+    """Add one message's risk to a decayed running aggregate."""
+    return aggregate * decay + risk
+
+def rolling_level(aggregate: float) -> int:
+    """Crisis level (0-10) for a rolling aggregate.
+
+    Rounded, not floored: a risk repeated every message approaches
+    risk / (1 - decay) without reaching it, so flooring would keep a user who
+    says "I want to die" every turn one level below the high-risk threshold.
+    """
+    return min(int(aggregate + 0.5), 10)
+
+def update_crisis_score(
+    crisis_score: Optional[Dict[str, Any]],
+    messages: List[Any],
+    decay: float = 0.5
+) -> Dict[str, Any]:
+    """Fold newly arrived user messages into a rolling conversation-level crisis score.
+
+    The id of the last message seen is recorded, so each message is scored
+    once and a turn only scans the messages appended since; a user message
+    that just repeats the one before it (the intake echo) isn't scored again.
+    Each user message's risk is added to an exponentially decayed aggregate,
+    so risk that is spread across several messages builds up while a single
+    spike fades.
+    """
+    crisis_score = dict(crisis_score or {
+        "last_seen_id": None,
+        "latest": 0,
+        "aggregate": 0.0,
+        "level": 0
+    })
+    aggregate = crisis_score["aggregate"]
+    # Only this call's user messages count as the latest risk
+    crisis_score["latest"] = 0
+
+    start = _new_messages_start(messages, crisis_score.get("last_seen_id"))
+    for index in range(start, len(messages)):
+        message = messages[index]
+        if not _is_user_message(message) or is_echo(messages, index):
+            continue
+        risk = crisis_matcher.score(_message_text(message))["risk_level"]
+        aggregate = fold_risk(aggregate, risk, decay)
+        crisis_score["latest"] = risk
+
+    if messages and _message_id(messages[-1]) is not None:
+        crisis_score["last_seen_id"] = _message_id(messages[-1])
+    crisis_score.update(
+        aggregate=aggregate,
+        level=rolling_level(aggregate)
+    )
+    return crisis_score
+
+def effective_crisis_level(state: Dict[str, Any]) -> int:
+    """Return the higher of the assessed crisis level and the rolling conversation score."""
+    rolling = (state.get("crisis_score") or {}).get("level", 0)
+    return max(state.get("crisis_level") or 0, rolling)
@@ -0,0 +1,208 @@
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_FORMULARY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "formulary.json"
+)
+
+_NAME_RE = re.compile(r"[a-z]+")
+
+# Dose and form words that often follow a medication name ("zoloft 50 mg tablets")
+_IGNORED_WORDS = frozenset([
+    "mg", "mcg", "tablet", "tablets", "tab", "tabs", "capsule", "capsules", "pill", "pills",
+    "er", "xr", "sr", "xl", "cr", "dose", "doses", "medication", "medicine", "generic", "brand"
+])
+
+def normalize_name(name: str) -> str:
+    """Lowercase a medication name and reduce it to letter words, dropping dose and form words."""
+    return " ".join(word for word in _NAME_RE.findall(name.lower()) if word not in _IGNORED_WORDS)
+
+def max_edit_distance(name: str) -> int:
+    """Allowed typos for a name: none for short names, one for medium, two for long ones."""
+    if len(name) < 5:
+        return 0
+    if len(name) < 8:
+        return 1
+    return 2
+
+class _TrieNode:
+    __slots__ = ("children", "entry")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entry: Optional[int] = None
+
+class Formulary:
+    """In-memory medication reference keyed by generic and brand names.
+
+    Names are stored in a trie so exact lookups are a walk down the tree and
+    misspellings are found with a Levenshtein search that prunes branches
+    once they exceed the allowed distance.
+    """
+
+    def __init__(self, medications: List[Dict[str, Any]]):
+        self.medications = medications
+        self._root = _TrieNode()
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+        for index, medication in enumerate(medications):
+            names = [medication["generic"], *medication.get("brands", []), *medication.get("aliases", [])]
+            for name in names:
+                self._insert(normalize_name(name), index)
+
+        # Typo searches walk the whole trie; users repeat the same misspellings
+        self._resolve = lru_cache(maxsize=1024)(self._resolve_uncached)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Formulary":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["medications"])
+
+    def _insert(self, name: str, index: int) -> None:
+        node = self._root
+        for char in name:
+            node = node.children.setdefault(char, _TrieNode())
+        node.entry = index
+
+    def _exact(self, name: str) -> Optional[int]:
+        node = self._root
+        for char in name:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node.entry
+
+    def _fuzzy(self, name: str, max_distance: int) -> Optional[int]:
+        """Return the closest entry within max_distance edits, or None if there is none or it's ambiguous.
+
+        A name that is the query with letters added in front ("esketamine"
+        for "ketamine", "dextroamphetamine" for "amphetamine") is usually a
+        different medication, not a typo, so it never matches. Dropped
+        letters elsewhere ("adderal") are still typos.
+        """
+        matches: List[Tuple[int, int]] = []
+        first_row = list(range(len(name) + 1))
+
+        def walk(node: _TrieNode, char: str, previous_row: List[int], path: str) -> None:
+            row = [previous_row[0] + 1]
+            for column in range(1, len(name) + 1):
+                row.append(min(
+                    row[column - 1] + 1,
+                    previous_row[column] + 1,
+                    previous_row[column - 1] + (name[column - 1] != char)
+                ))
+
+            if node.entry is not None and row[-1] <= max_distance and not path.endswith(name):
+                matches.append((row[-1], node.entry))
+            if min(row) <= max_distance:
+                for next_char, child in node.children.items():
+                    walk(child, next_char, row, path + next_char)
+
+        for char, child in self._root.children.items():
+            walk(child, char, first_row, char)
+
+        if not matches:
+            return None
+        best = min(distance for distance, _ in matches)
+        entries = {entry for distance, entry in matches if distance == best}
+        # Two different medications equally close to a typo: don't guess
+        return entries.pop() if len(entries) == 1 else None
+
+    def _resolve_uncached(self, name: str) -> Tuple[Optional[int], bool]:
+        """Return (entry index, whether it took a fuzzy match) for a normalized name."""
+        words = name.split()
+        # Whole phrase first ("buprenorphine naloxone"), then each word ("zoloft" in "zoloft for anxiety")
+        candidates = [name] + [word for word in words if len(words) > 1]
+
+        for candidate in candidates:
+            index = self._exact(candidate)
+            if index is not None:
+                return index, False
+
+        for candidate in candidates:
+            index = self._fuzzy(candidate, max_edit_distance(candidate))
+            if index is not None:
+                return index, True
+
+        return None, False
+
+    def match(self, medication_name: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return (medication, whether it was a typo match) for a name; (None, False) when nothing matches."""
+        name = normalize_name(medication_name)
+        index, fuzzy = self._resolve(name) if name else (None, False)
+
+        if index is None:
+            self.misses += 1
+            return None, False
+        if fuzzy:
+            self.fuzzy_hits += 1
+        else:
+            self.hits += 1
+        return self.medications[index], fuzzy
+
+    def lookup(self, medication_name: str) -> Optional[Dict[str, Any]]:
+        """Find a medication by generic or brand name, tolerating typos, dose text and extra words."""
+        return self.match(medication_name)[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "medications": len(self.medications),
+            "hits": self.hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses
+        }
+
+def format_medication(medication: Dict[str, Any]) -> str:
+    """Render a formulary entry as compact labeled lines."""
+    lines = [f"{medication['generic']} ({', '.join(medication['brands'])})" if medication.get("brands") else medication["generic"]]
+    lines.append(f"Drug class: {medication['drug_class']}")
+    lines.append(f"Commonly prescribed for: {'; '.join(medication['used_for'])}")
+    lines.append(f"Common side effects: {'; '.join(medication['common_side_effects'])}")
+    lines.extend(f"- {note}" for note in medication.get("safety", []))
+    return "\n".join(lines)
+
+def local_medication_information(medication_name: str) -> Optional[str]:
+    """Answer a medication question from the formulary; None when there's no data file or no match.
+
+    A typo match is headed with the medication it resolved to, not the
+    user's spelling, so a wrong guess is visible.
+    """
+    formulary = get_formulary()
+    if formulary is None:
+        return None
+
+    medication, fuzzy = formulary.match(medication_name)
+    if medication is None:
+        return None
+    if fuzzy:
+        return (
+            f"Showing results for {medication['generic']} (no exact match for \"{medication_name}\"):\n"
+            f"{format_medication(medication)}\n(Source: local medication reference)"
+        )
+    return f"General information about {medication_name}:\n{format_medication(medication)}\n(Source: local medication reference)"
+
+_formulary: Optional[Formulary] = None
+_formulary_lock = threading.Lock()
+
+def get_formulary() -> Optional[Formulary]:
+    """Return the shared formulary, or None if the data file is missing.
+
+    The data file comes from FORMULARY_PATH.
+    """
+    global _formulary
+
+    if _formulary is None:
+        path = os.getenv("FORMULARY_PATH", DEFAULT_FORMULARY_PATH)
+        if not os.path.exists(path):
+            return None
+        with _formulary_lock:
+            if _formulary is None:
+                _formulary = Formulary.from_file(path)
+
+    return _formulary
@@ -0,0 +1,387 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from tools.search_canonical import ISSUE_SYNONYMS, STATE_ABBREVIATIONS
+
+DEFAULT_DIRECTORY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "provider_directory.sqlite3"
+)
+
+# Fields accepted from CSV/JSON exports; multi-valued fields may be lists or
+# strings separated by ";" or "|"
+THERAPIST_FIELDS = ("name", "credentials", "specializations", "insurance", "city", "state", "zip", "phone", "website", "telehealth")
+SUPPORT_GROUP_FIELDS = ("name", "organization", "issue_types", "format", "city", "state", "zip", "schedule", "contact", "website")
+
+GROUP_FORMATS = ("online", "in_person", "both")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS therapists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    credentials TEXT,
+    specializations TEXT,
+    insurance TEXT,
+    city TEXT,
+    city_key TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT '',
+    zip TEXT NOT NULL DEFAULT '',
+    phone TEXT,
+    website TEXT,
+    telehealth INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_therapists_state_city ON therapists (state, city_key);
+CREATE INDEX IF NOT EXISTS idx_therapists_zip ON therapists (zip);
+
+CREATE TABLE IF NOT EXISTS therapist_specializations (
+    therapist_id INTEGER NOT NULL REFERENCES therapists (id) ON DELETE CASCADE,
+    specialization TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_therapist_specializations ON therapist_specializations (specialization, therapist_id);
+
+CREATE TABLE IF NOT EXISTS therapist_insurance (
+    therapist_id INTEGER NOT NULL REFERENCES therapists (id) ON DELETE CASCADE,
+    insurer TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_therapist_insurance ON therapist_insurance (insurer, therapist_id);
+
+CREATE TABLE IF NOT EXISTS support_groups (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    organization TEXT,
+    issue_types TEXT,
+    format TEXT NOT NULL DEFAULT 'both',
+    city TEXT,
+    city_key TEXT NOT NULL DEFAULT '',
+    state TEXT NOT NULL DEFAULT '',
+    zip TEXT NOT NULL DEFAULT '',
+    schedule TEXT,
+    contact TEXT,
+    website TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_support_groups_state_city ON support_groups (state, city_key);
+CREATE INDEX IF NOT EXISTS idx_support_groups_zip ON support_groups (zip);
+CREATE INDEX IF NOT EXISTS idx_support_groups_format ON support_groups (format);
+
+CREATE TABLE IF NOT EXISTS support_group_issues (
+    group_id INTEGER NOT NULL REFERENCES support_groups (id) ON DELETE CASCADE,
+    issue TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_support_group_issues ON support_group_issues (issue, group_id);
+"""
+
+# All 50 states plus DC
+_STATE_CODES = frozenset(STATE_ABBREVIATIONS.values())
+# A full ZIP (optionally ZIP+4) anywhere; a shorter prefix only as the whole location
+_ZIP_RE = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+_ZIP_PREFIX_RE = re.compile(r"\d{3,5}")
+_SPLIT_RE = re.compile(r"\s*(?:[;|,/]|\band\b|&)\s*")
+
+def _split_values(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in re.split(r"[;|]", str(value)) if item.strip()]
+
+def normalize_issue(issue: str) -> str:
+    """Map an issue or specialization to its canonical term ("anxious" -> "anxiety")."""
+    issue = " ".join(issue.lower().replace("-", " ").split())
+    return ISSUE_SYNONYMS.get(issue, issue)
+
+def _issue_terms(text: str) -> List[str]:
+    return sorted({normalize_issue(term) for term in _SPLIT_RE.split(text.lower()) if term.strip()})
+
+def normalize_state(state: str) -> str:
+    state = " ".join(state.lower().replace(".", "").split())
+    return STATE_ABBREVIATIONS.get(state, state)
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """Return bounds so `column >= low AND column < high` is an indexable prefix match."""
+    return prefix, prefix + "\uffff"
+
+def parse_location(location: str) -> Dict[str, str]:
+    """Split a free-text location into zip prefix, state code and city.
+
+    Accepts forms like "02139", "021", "Cambridge, MA", "austin texas" or
+    "Ohio". Returns an empty dict for locations that can't be narrowed.
+    """
+    text = location.strip().lower()
+
+    if _ZIP_PREFIX_RE.fullmatch(text):
+        return {"zip_prefix": text}
+    zip_match = _ZIP_RE.search(text)
+    if zip_match:
+        return {"zip_prefix": zip_match.group(1)}
+
+    parts = [part.strip() for part in text.replace(".", "").split(",") if part.strip()]
+    if not parts:
+        return {}
+
+    if len(parts) >= 2:
+        state = normalize_state(parts[-1])
+        if state in _STATE_CODES:
+            # "12 Main St, Cambridge, MA": the city is right before the state
+            return {"city": parts[-2], "state": state}
+        # Skip street and unit parts ("Apt 123, Boston")
+        return {"city": next((part for part in parts if not any(char.isdigit() for char in part)), parts[0])}
+
+    words = parts[0].split()
+    # "austin tx", "austin texas", "santa fe new mexico"
+    for size in (2, 1):
+        if len(words) > size:
+            state = normalize_state(" ".join(words[-size:]))
+            if state in _STATE_CODES:
+                return {"city": " ".join(words[:-size]), "state": state}
+
+    state = normalize_state(parts[0])
+    if state in _STATE_CODES:
+        return {"state": state}
+    return {"city": parts[0]}
+
+def _location_clause(location: Dict[str, str]) -> Tuple[str, List[str]]:
+    if "zip_prefix" in location:
+        low, high = _prefix_range(location["zip_prefix"])
+        return "zip >= ? AND zip < ?", [low, high]
+
+    clauses, params = [], []
+    if "state" in location:
+        clauses.append("state = ?")
+        params.append(location["state"])
+    if "city" in location:
+        low, high = _prefix_range(location["city"])
+        clauses.append("city_key >= ? AND city_key < ?")
+        params.extend([low, high])
+    return " AND ".join(clauses), params
+
+class ProviderDirectory:
+    """SQLite-backed local directory of therapists and support groups.
+
+    Loaded from CSV/JSON exports with `load_file`; looked up by location
+    (ZIP prefix, city prefix, state), specialization/issue, insurance and
+    group format.
+    """
+
+    def __init__(self, path: str, max_results: int = 10):
+        self.path = path
+        self.max_results = max_results
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def _record_lookup(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if rows:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return rows
+
+    def find_therapists(self, location: str, specialization: str, insurance: str = "any") -> List[Dict[str, Any]]:
+        """Return therapists near a location who treat the specialization (and take the insurance)."""
+        where, params = _location_clause(parse_location(location))
+        if not where:
+            return self._record_lookup([])
+
+        joins, join_params = [], []
+        specializations = _issue_terms(specialization)
+        if specializations:
+            joins.append(
+                "JOIN therapist_specializations s ON s.therapist_id = t.id AND s.specialization IN (%s)"
+                % ",".join("?" * len(specializations))
+            )
+            join_params.extend(specializations)
+        insurer = " ".join(insurance.lower().replace("insurance", "").split())
+        if insurer and insurer not in ("any", "none", "accepted"):
+            joins.append("JOIN therapist_insurance i ON i.therapist_id = t.id AND i.insurer = ?")
+            join_params.append(insurer)
+
+        sql = (
+            f"SELECT DISTINCT t.name, t.credentials, t.specializations, t.insurance, t.city, t.state, t.zip, "
+            f"t.phone, t.website, t.telehealth FROM therapists t {' '.join(joins)} WHERE {where} "
+            f"ORDER BY t.name LIMIT ?"
+        )
+        params = join_params + params + [self.max_results]
+
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, params)]
+            return self._record_lookup(rows)
+
+    def find_support_groups(self, location: str, issue_type: str, format_preference: str = "both") -> List[Dict[str, Any]]:
+        """Return support groups for an issue near a location, honoring the format preference.
+
+        Online groups with no fixed location match any location unless
+        in-person groups were requested.
+        """
+        issues = _issue_terms(issue_type)
+        if not issues:
+            return self._record_lookup([])
+
+        where, params = _location_clause(parse_location(location))
+        if format_preference != "in_person":
+            where = f"({where}) OR (g.format = 'online' AND g.state = '' AND g.zip = '')" if where else "g.format = 'online'"
+        if not where:
+            return self._record_lookup([])
+
+        format_clause = ""
+        if format_preference in ("online", "in_person"):
+            format_clause = "AND g.format IN (?, 'both')"
+            params = params + [format_preference]
+
+        sql = (
+            f"SELECT DISTINCT g.name, g.organization, g.issue_types, g.format, g.city, g.state, g.zip, "
+            f"g.schedule, g.contact, g.website FROM support_groups g "
+            f"JOIN support_group_issues s ON s.group_id = g.id AND s.issue IN ({','.join('?' * len(issues))}) "
+            f"WHERE ({where}) {format_clause} ORDER BY g.name LIMIT ?"
+        )
+
+        with self._lock:
+            rows = [dict(row) for row in self._conn.execute(sql, issues + params + [self.max_results])]
+            return self._record_lookup(rows)
+
+    def load_records(self, kind: str, records: Iterable[Dict[str, Any]], replace: bool = False) -> int:
+        """Bulk-insert therapist or support group records in one transaction; returns the count."""
+        if kind not in ("therapists", "support_groups"):
+            raise ValueError(f"Unknown directory kind: {kind}")
+
+        count = 0
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute(f"DELETE FROM {kind}")
+
+            for record in records:
+                if not record.get("name"):
+                    continue
+                location = (
+                    str(record.get("city") or "").strip(),
+                    normalize_state(str(record.get("state") or "")),
+                    str(record.get("zip") or "").strip()[:5]
+                )
+                city_key = " ".join(location[0].lower().split())
+
+                if kind == "therapists":
+                    specializations = _split_values(record.get("specializations"))
+                    insurers = _split_values(record.get("insurance"))
+                    cursor = self._conn.execute(
+                        "INSERT INTO therapists (name, credentials, specializations, insurance, city, city_key, state, zip, phone, website, telehealth) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (record["name"], record.get("credentials"), "; ".join(specializations), "; ".join(insurers),
+                         location[0], city_key, location[1], location[2], record.get("phone"), record.get("website"),
+                         1 if str(record.get("telehealth", "")).lower() in ("1", "true", "yes") else 0)
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO therapist_specializations (therapist_id, specialization) VALUES (?, ?)",
+                        [(cursor.lastrowid, normalize_issue(item)) for item in specializations]
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO therapist_insurance (therapist_id, insurer) VALUES (?, ?)",
+                        [(cursor.lastrowid, " ".join(item.lower().split())) for item in insurers]
+                    )
+                else:
+                    issues = _split_values(record.get("issue_types"))
+                    group_format = str(record.get("format") or "both").lower().replace("-", "_").replace(" ", "_")
+                    cursor = self._conn.execute(
+                        "INSERT INTO support_groups (name, organization, issue_types, format, city, city_key, state, zip, schedule, contact, website) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (record["name"], record.get("organization"), "; ".join(issues),
+                         group_format if group_format in GROUP_FORMATS else "both",
+                         location[0], city_key, location[1], location[2], record.get("schedule"), record.get("contact"), record.get("website"))
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO support_group_issues (group_id, issue) VALUES (?, ?)",
+                        [(cursor.lastrowid, normalize_issue(item)) for item in issues]
+                    )
+                count += 1
+
+        return count
+
+    def load_file(self, kind: str, path: str, replace: bool = False) -> int:
+        """Bulk-load a CSV export or a JSON/JSONL list of records."""
+        with open(path, encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                return self.load_records(kind, csv.DictReader(f), replace=replace)
+            if path.endswith(".jsonl"):
+                return self.load_records(kind, (json.loads(line) for line in f if line.strip()), replace=replace)
+            return self.load_records(kind, json.load(f), replace=replace)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            therapists = self._conn.execute("SELECT COUNT(*) FROM therapists").fetchone()[0]
+            groups = self._conn.execute("SELECT COUNT(*) FROM support_groups").fetchone()[0]
+        return {"therapists": therapists, "support_groups": groups, "hits": self.hits, "misses": self.misses}
+
+def format_therapist(row: Dict[str, Any]) -> str:
+    name = f"{row['name']}, {row['credentials']}" if row.get("credentials") else row["name"]
+    place = " ".join(part for part in (f"{row['city']}," if row.get("city") else "", row.get("state", "").upper(), row.get("zip", "")) if part)
+    details = [
+        f"specializes in {row['specializations']}" if row.get("specializations") else "",
+        f"insurance: {row['insurance']}" if row.get("insurance") else "",
+        place,
+        "telehealth available" if row.get("telehealth") else "",
+        row.get("phone") or "",
+        row.get("website") or ""
+    ]
+    return f"- {name} | " + " | ".join(detail for detail in details if detail)
+
+def format_support_group(row: Dict[str, Any]) -> str:
+    place = " ".join(part for part in (f"{row['city']}," if row.get("city") else "", row.get("state", "").upper(), row.get("zip", "")) if part)
+    details = [
+        row.get("organization") or "",
+        f"for {row['issue_types']}" if row.get("issue_types") else "",
+        row["format"].replace("_", "-"),
+        place,
+        row.get("schedule") or "",
+        row.get("contact") or "",
+        row.get("website") or ""
+    ]
+    return f"- {row['name']} | " + " | ".join(detail for detail in details if detail)
+
+_provider_directory: Optional[ProviderDirectory] = None
+_provider_directory_lock = threading.Lock()
+
+def get_provider_directory() -> Optional[ProviderDirectory]:
+    """Return the shared provider directory, or None if none has been loaded.
+
+    The database location comes from PROVIDER_DIRECTORY_PATH.
+    """
+    global _provider_directory
+
+    if _provider_directory is None:
+        path = os.getenv("PROVIDER_DIRECTORY_PATH", DEFAULT_DIRECTORY_PATH)
+        if not os.path.exists(path):
+            return None
+        with _provider_directory_lock:
+            if _provider_directory is None:
+                _provider_directory = ProviderDirectory(path)
+
+    return _provider_directory
+
+def main():
+    """Bulk-load therapist or support group exports into the provider directory."""
+
+    parser = argparse.ArgumentParser(description="Load CSV/JSON exports into the local provider directory.")
+    parser.add_argument("kind", choices=["therapists", "support_groups"])
+    parser.add_argument("files", nargs="+", help=".csv, .json or .jsonl exports")
+    parser.add_argument("--replace", action="store_true", help="clear existing records of this kind first")
+    parser.add_argument("--db", default=os.getenv("PROVIDER_DIRECTORY_PATH", DEFAULT_DIRECTORY_PATH))
+    args = parser.parse_args()
+
+    directory = ProviderDirectory(args.db)
+    for index, path in enumerate(args.files):
+        count = directory.load_file(args.kind, path, replace=args.replace and index == 0)
+        print(f"Loaded {count} {args.kind} from {path}")
+    print(json.dumps(directory.stats()))
+
+if __name__ == "__main__":
+    main()
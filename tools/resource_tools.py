@@ -1,21 +1,14 @@
 from langchain.tools import tool
-from langchain_community.utilities import GoogleSerperAPIWrapper
+from tools.search_client import run_search, arun_search
+from tools.formulary import local_medication_information
+from tools.search_results import degraded
 from typing import Dict, Any
 
-# Initialize search wrapper
-search_wrapper = GoogleSerperAPIWrapper()
+def _insurance_query(insurance_type: str, service_needed: str) -> str:
+    return f"{insurance_type} insurance coverage {service_needed} mental health benefits therapy counseling"
 
-@tool
-def insurance_navigator(insurance_type: str, service_needed: str) -> str:
-    """Help navigate insurance coverage for mental health services."""
-    
-    query = f"{insurance_type} insurance coverage {service_needed} mental health benefits therapy counseling"
-    
-    try:
-        results = search_wrapper.run(query)
-        return f"Insurance information for {insurance_type} covering {service_needed}:\n{results}"
-    except Exception as e:
-        return f"""General insurance guidance for mental health services:
+def _insurance_fallback() -> str:
+    return degraded(f"""General insurance guidance for mental health services:
         
         Under the Mental Health Parity Act, insurance must cover mental health services similarly to physical health.
         
@@ -31,19 +24,36 @@ def insurance_navigator(insurance_type: str, service_needed: str) -> str:
         3. Request a list of in-network providers
         4. Understand your deductible and out-of-pocket costs
         
-        If you need help understanding your benefits, contact your insurance company directly."""
+        If you need help understanding your benefits, contact your insurance company directly.""")
 
 @tool
-def mental_health_education(topic: str, reading_level: str = "general") -> str:
-    """Provide educational content about mental health topics."""
+def insurance_navigator(insurance_type: str, service_needed: str) -> str:
+    """Help navigate insurance coverage for mental health services."""
     
-    query = f"mental health education {topic} {reading_level} evidence-based information patient education"
+    query = _insurance_query(insurance_type, service_needed)
     
     try:
-        results = search_wrapper.run(query)
-        return f"Educational resources about {topic} (reading level: {reading_level}):\n{results}"
-    except Exception as e:
-        return f"""Educational information about {topic}:
+        results = run_search(query, "insurance_navigator")
+        return f"Insurance information for {insurance_type} covering {service_needed}:\n{results}"
+    except Exception:
+        return _insurance_fallback()
+
+async def _ainsurance_navigator(insurance_type: str, service_needed: str) -> str:
+    query = _insurance_query(insurance_type, service_needed)
+    
+    try:
+        results = await arun_search(query, "insurance_navigator")
+        return f"Insurance information for {insurance_type} covering {service_needed}:\n{results}"
+    except Exception:
+        return _insurance_fallback()
+
+insurance_navigator.coroutine = _ainsurance_navigator
+
+def _education_query(topic: str, reading_level: str) -> str:
+    return f"mental health education {topic} {reading_level} evidence-based information patient education"
+
+def _education_fallback(topic: str) -> str:
+    return degraded(f"""Educational information about {topic}:
         
         For reliable mental health information, visit:
         - National Institute of Mental Health (NIMH.nih.gov)
@@ -52,19 +62,36 @@ def mental_health_education(topic: str, reading_level: str = "general") -> str:
         - American Psychological Association (APA.org)
         - Substance Abuse and Mental Health Services Administration (SAMHSA.gov)
         
-        These sources provide evidence-based information about mental health conditions, treatments, and resources."""
+        These sources provide evidence-based information about mental health conditions, treatments, and resources.""")
 
 @tool
-def medication_information(medication_name: str) -> str:
-    """Provide general information about psychiatric medications."""
+def mental_health_education(topic: str, reading_level: str = "general") -> str:
+    """Provide educational content about mental health topics."""
     
-    query = f"{medication_name} psychiatric medication information side effects patient education FDA approved"
+    query = _education_query(topic, reading_level)
     
     try:
-        results = search_wrapper.run(query)
-        return f"General information about {medication_name}:\n{results}\n\n⚠️ IMPORTANT: This is general information only. Always consult with your prescribing physician about medications, side effects, and any concerns."
-    except Exception as e:
-        return f"""General medication information for {medication_name}:
+        results = run_search(query, "mental_health_education", local_first=True)
+        return f"Educational resources about {topic} (reading level: {reading_level}):\n{results}"
+    except Exception:
+        return _education_fallback(topic)
+
+async def _amental_health_education(topic: str, reading_level: str = "general") -> str:
+    query = _education_query(topic, reading_level)
+    
+    try:
+        results = await arun_search(query, "mental_health_education", local_first=True)
+        return f"Educational resources about {topic} (reading level: {reading_level}):\n{results}"
+    except Exception:
+        return _education_fallback(topic)
+
+mental_health_education.coroutine = _amental_health_education
+
+def _medication_query(medication_name: str) -> str:
+    return f"{medication_name} psychiatric medication information side effects patient education FDA approved"
+
+def _medication_fallback(medication_name: str) -> str:
+    return degraded(f"""General medication information for {medication_name}:
         
         ⚠️ IMPORTANT DISCLAIMER: This is general information only. Always consult with your prescribing physician about medications.
         
@@ -74,19 +101,44 @@ def medication_information(medication_name: str) -> str:
         - Visit FDA.gov for official drug information
         - Use MedlinePlus.gov for patient-friendly information
         
-        Never start, stop, or change medications without consulting your healthcare provider."""
+        Never start, stop, or change medications without consulting your healthcare provider.""")
 
 @tool
-def community_resources(location: str, resource_type: str = "general") -> str:
-    """Find local community mental health resources and services."""
+def medication_information(medication_name: str) -> str:
+    """Provide general information about psychiatric medications."""
     
-    query = f"community mental health resources {location} {resource_type} local services support"
+    local = local_medication_information(medication_name)
+    if local is not None:
+        return f"{local}\n\n⚠️ IMPORTANT: This is general information only. Always consult with your prescribing physician about medications, side effects, and any concerns."
+    
+    query = _medication_query(medication_name)
     
     try:
-        results = search_wrapper.run(query)
-        return f"Community mental health resources in {location}:\n{results}"
-    except Exception as e:
-        return f"""To find community mental health resources in {location}:
+        results = run_search(query, "medication_information")
+        return f"General information about {medication_name}:\n{results}\n\n⚠️ IMPORTANT: This is general information only. Always consult with your prescribing physician about medications, side effects, and any concerns."
+    except Exception:
+        return _medication_fallback(medication_name)
+
+async def _amedication_information(medication_name: str) -> str:
+    local = local_medication_information(medication_name)
+    if local is not None:
+        return f"{local}\n\n⚠️ IMPORTANT: This is general information only. Always consult with your prescribing physician about medications, side effects, and any concerns."
+    
+    query = _medication_query(medication_name)
+    
+    try:
+        results = await arun_search(query, "medication_information")
+        return f"General information about {medication_name}:\n{results}\n\n⚠️ IMPORTANT: This is general information only. Always consult with your prescribing physician about medications, side effects, and any concerns."
+    except Exception:
+        return _medication_fallback(medication_name)
+
+medication_information.coroutine = _amedication_information
+
+def _community_query(location: str, resource_type: str) -> str:
+    return f"community mental health resources {location} {resource_type} local services support"
+
+def _community_fallback(location: str) -> str:
+    return degraded(f"""To find community mental health resources in {location}:
         
         1. Contact your local health department
         2. Call 211 (community resource helpline)
@@ -95,19 +147,36 @@ def community_resources(location: str, resource_type: str = "general") -> str:
         5. Contact local NAMI chapter
         6. Search for community mental health centers
         7. Check with religious organizations for counseling services
-        8. Look into employee assistance programs (EAP) if employed"""
+        8. Look into employee assistance programs (EAP) if employed""")
 
 @tool
-def crisis_resource_locator(location: str, crisis_type: str = "general") -> str:
-    """Locate specific crisis intervention resources and services."""
+def community_resources(location: str, resource_type: str = "general") -> str:
+    """Find local community mental health resources and services."""
     
-    query = f"crisis intervention resources {location} {crisis_type} emergency mental health mobile crisis team"
+    query = _community_query(location, resource_type)
     
     try:
-        results = search_wrapper.run(query)
-        return f"Crisis intervention resources in {location}:\n{results}"
-    except Exception as e:
-        return f"""Crisis resources for {location}:
+        results = run_search(query, "community_resources")
+        return f"Community mental health resources in {location}:\n{results}"
+    except Exception:
+        return _community_fallback(location)
+
+async def _acommunity_resources(location: str, resource_type: str = "general") -> str:
+    query = _community_query(location, resource_type)
+    
+    try:
+        results = await arun_search(query, "community_resources")
+        return f"Community mental health resources in {location}:\n{results}"
+    except Exception:
+        return _community_fallback(location)
+
+community_resources.coroutine = _acommunity_resources
+
+def _crisis_locator_query(location: str, crisis_type: str) -> str:
+    return f"crisis intervention resources {location} {crisis_type} emergency mental health mobile crisis team"
+
+def _crisis_locator_fallback(location: str) -> str:
+    return degraded(f"""Crisis resources for {location}:
         
         🚨 IMMEDIATE CRISIS:
         - Call 911 for immediate danger
@@ -119,4 +188,27 @@ def crisis_resource_locator(location: str, crisis_type: str = "general") -> str:
         - Call your local police (ask for crisis intervention team)
         - Search for "mobile crisis team {location}"
         - Contact local community mental health center
-        - Call 211 for local crisis resources"""
+        - Call 211 for local crisis resources""")
+
+@tool
+def crisis_resource_locator(location: str, crisis_type: str = "general") -> str:
+    """Locate specific crisis intervention resources and services."""
+    
+    query = _crisis_locator_query(location, crisis_type)
+    
+    try:
+        results = run_search(query, "crisis_resource_locator")
+        return f"Crisis intervention resources in {location}:\n{results}"
+    except Exception:
+        return _crisis_locator_fallback(location)
+
+async def _acrisis_resource_locator(location: str, crisis_type: str = "general") -> str:
+    query = _crisis_locator_query(location, crisis_type)
+    
+    try:
+        results = await arun_search(query, "crisis_resource_locator")
+        return f"Crisis intervention resources in {location}:\n{results}"
+    except Exception:
+        return _crisis_locator_fallback(location)
+
+crisis_resource_locator.coroutine = _acrisis_resource_locator
\ No newline at end of file
@@ -0,0 +1,138 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from tools.search_results import estimate_tokens
+
+# Rough prompt-token budget for one tool result sent back to the LLM
+DEFAULT_RESULT_TOKEN_BUDGET = int(os.getenv("TOOL_RESULT_TOKEN_BUDGET", "600"))
+
+TOOL_RESULT_TOKEN_BUDGETS: Dict[str, int] = {
+    # Multi-section plans the LLM is expected to summarize from
+    "generate_wellness_plan": 900,
+    "stress_management_plan": 900,
+    "generate_cbt_exercise": 1100,
+    "mindfulness_exercise_generator": 1100,
+}
+
+# Sections whose sub-entries are kept only when they relate to a call argument,
+# e.g. only the nutrition goals the user asked about
+RELEVANCE_FILTERS: Dict[str, Dict[str, str]] = {
+    "nutrition_guidance": {"mood_supporting_nutrients": "nutrition_goals"},
+    "exercise_recommendations": {"exercise_types_benefits": "exercise_preferences"},
+}
+
+TRUNCATED = "…(truncated)"
+
+_WORD_RE = re.compile(r"[a-z]{4,}")
+
+def result_budget_for(tool_name: str) -> int:
+    """Return the token budget for a tool's encoded result."""
+    return TOOL_RESULT_TOKEN_BUDGETS.get(tool_name, DEFAULT_RESULT_TOKEN_BUDGET)
+
+def _arg_words(value: Any) -> set:
+    return set(_WORD_RE.findall(str(value).lower()))
+
+def _filter_relevant(section: Dict[str, Any], words: set) -> Dict[str, Any]:
+    """Keep sub-entries whose name or content mentions one of the words (all if none do)."""
+    relevant = {
+        key: value for key, value in section.items()
+        if words & (_arg_words(key.replace("_", " ")) | _arg_words(value))
+    }
+    return relevant or section
+
+def prune_result(tool_name: str, result: Dict[str, Any], args: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Drop sections the LLM doesn't need: echoed arguments, empty values and irrelevant sub-entries."""
+    args = args or {}
+    arg_values = {str(value) for value in args.values() if isinstance(value, (str, int, float))}
+    filters = RELEVANCE_FILTERS.get(tool_name, {})
+
+    pruned = {}
+    for key, value in result.items():
+        # The LLM already knows what it passed in
+        if isinstance(value, (str, int, float)) and str(value) in arg_values:
+            continue
+        if value is None or value == [] or value == {}:
+            continue
+        if key in filters and isinstance(value, dict) and filters[key] in args:
+            value = _filter_relevant(value, _arg_words(args[filters[key]]))
+        pruned[key] = value
+
+    return pruned
+
+def _render_lines(value: Any, indent: int = 0) -> List[str]:
+    pad = "  " * indent
+
+    if isinstance(value, dict):
+        lines = []
+        for key, item in value.items():
+            label = str(key).replace("_", " ")
+            if isinstance(item, dict):
+                lines.append(f"{pad}{label}:")
+                lines.extend(_render_lines(item, indent + 1))
+            elif isinstance(item, (list, tuple)) and any(isinstance(element, (dict, list, tuple)) for element in item):
+                lines.append(f"{pad}{label}:")
+                lines.extend(_render_lines(item, indent + 1))
+            else:
+                lines.append(f"{pad}{label}: {_render_inline(item)}")
+        return lines
+
+    if isinstance(value, (list, tuple)):
+        lines = []
+        for item in value:
+            if isinstance(item, (dict, list, tuple)):
+                lines.extend(_render_lines(item, indent))
+            else:
+                lines.append(f"{pad}- {item}")
+        return lines
+
+    return [f"{pad}{value}"]
+
+def _render_inline(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(item) for item in value)
+    return str(value)
+
+def _truncate_lines(lines: List[str], max_tokens: int) -> str:
+    kept = []
+    used = 0
+
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            if not kept:
+                kept.append(line[:max_tokens * 4])
+            kept.append(TRUNCATED)
+            break
+        kept.append(line)
+        used += cost
+
+    return "\n".join(kept)
+
+def encode_tool_result(
+    tool_name: str,
+    result: Any,
+    args: Optional[Dict[str, Any]] = None,
+    as_json: bool = False
+) -> str:
+    """Render a tool result as compact text (or minified JSON) within the tool's token budget.
+
+    Dict results are pruned with prune_result first; strings are only trimmed
+    to the budget.
+    """
+    max_tokens = result_budget_for(tool_name)
+
+    if isinstance(result, dict):
+        result = prune_result(tool_name, result, args)
+        if as_json:
+            text = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+            if estimate_tokens(text) <= max_tokens:
+                return text
+            return text[:max_tokens * 4] + TRUNCATED
+        return _truncate_lines(_render_lines(result), max_tokens)
+
+    if isinstance(result, (list, tuple)):
+        return _truncate_lines(_render_lines(result), max_tokens)
+
+    return _truncate_lines(str(result).splitlines(), max_tokens)
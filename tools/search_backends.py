@@ -0,0 +1,174 @@
+import glob
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from tools.search_results import make_record
+
+class SearchBackend:
+    """Interface for anything the search tools can send a query to.
+
+    `search` returns title/url/snippet records, or None when the backend has
+    nothing relevant so the caller can fall through to the next backend.
+    """
+
+    name = "base"
+
+    def search(self, query: str) -> Optional[List[Dict[str, str]]]:
+        raise NotImplementedError
+
+    async def asearch(self, query: str) -> Optional[List[Dict[str, str]]]:
+        return self.search(query)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in",
+    "is", "it", "of", "on", "or", "that", "the", "to", "what", "with", "your", "you"
+])
+
+# Words the tool query templates add to every query; they help web ranking
+# but say nothing about whether the local corpus covers the topic
+QUERY_FILLER = frozenset([
+    "mental", "health", "resources", "information", "educational", "materials", "support",
+    "evidence", "based", "evidence-based", "treatment", "patient", "education", "general",
+    "level", "pdf", "download", "free", "best", "apps", "audio", "video", "guidelines",
+    "approaches", "options", "therapy", "techniques", "instructions", "exercise", "exercises"
+])
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+class LocalIndexBackend(SearchBackend):
+    """BM25 inverted-index search over a curated local corpus.
+
+    A query only counts as a hit when a document covers at least
+    `min_coverage` of the IDF weight of the query's topic terms (template
+    filler is ignored). Terms the corpus has never seen (a city, an unknown
+    topic) carry the highest weight, so location-specific or off-topic
+    queries miss and fall through to the web.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        documents: Iterable[Dict[str, Any]],
+        top_k: int = 3,
+        min_coverage: float = 0.5,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        self.documents: List[Dict[str, Any]] = list(documents)
+        self.top_k = top_k
+        self.min_coverage = min_coverage
+        self.k1 = k1
+        self.b = b
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._postings: Dict[str, List[tuple]] = defaultdict(list)
+        self._doc_lengths: List[int] = []
+
+        for doc_id, doc in enumerate(self.documents):
+            terms = tokenize(" ".join([
+                doc.get("title", ""),
+                " ".join(doc.get("tags", [])),
+                doc.get("text", "")
+            ]))
+            self._doc_lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                self._postings[term].append((doc_id, frequency))
+
+        total_docs = len(self.documents)
+        self._avg_length = sum(self._doc_lengths) / total_docs if total_docs else 0.0
+        self._idf = {
+            term: math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+        self._unseen_idf = math.log(1 + (total_docs + 0.5) / 0.5)
+
+    @classmethod
+    def from_paths(cls, paths: Iterable[str], **kwargs: Any) -> "LocalIndexBackend":
+        """Build an index from .json/.jsonl files or directories containing them."""
+        return cls(load_corpus(paths), **kwargs)
+
+    def rank(self, query: str) -> List[tuple]:
+        """Return (score, coverage, doc_id) tuples for matching documents, best first."""
+        query_terms = set(tokenize(query))
+        if not query_terms or not self.documents:
+            return []
+
+        topic_terms = (query_terms - QUERY_FILLER) or query_terms
+        scores: Dict[int, float] = defaultdict(float)
+        matched_weight: Dict[int, float] = defaultdict(float)
+        total_weight = sum(self._idf.get(term, self._unseen_idf) for term in topic_terms)
+
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for doc_id, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / self._avg_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+                if term in topic_terms:
+                    matched_weight[doc_id] += idf
+
+        return sorted(
+            ((score, matched_weight[doc_id] / total_weight, doc_id) for doc_id, score in scores.items()),
+            reverse=True
+        )
+
+    def search(self, query: str) -> Optional[List[Dict[str, str]]]:
+        ranked = [entry for entry in self.rank(query) if entry[1] >= self.min_coverage][:self.top_k]
+
+        with self._lock:
+            if ranked:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not ranked:
+            return None
+
+        return [
+            make_record(self.documents[doc_id].get("title"), self.documents[doc_id].get("url"), self.documents[doc_id].get("text"))
+            for _, _, doc_id in ranked
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "documents": len(self.documents),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+def load_corpus(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """Load corpus documents from .json (list of docs) and .jsonl files or directories."""
+    documents: List[Dict[str, Any]] = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, "*.json")) + glob.glob(os.path.join(path, "*.jsonl")))
+        else:
+            files = [path]
+
+        for file_path in files:
+            with open(file_path, encoding="utf-8") as f:
+                if file_path.endswith(".jsonl"):
+                    documents.extend(json.loads(line) for line in f if line.strip())
+                else:
+                    documents.extend(json.load(f))
+
+    return documents
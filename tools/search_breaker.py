@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend while its circuit is open."""
+
+class CircuitBreaker:
+    """Stop calling a backend that keeps failing or responding slowly.
+
+    After `failure_threshold` consecutive failures or slow calls the circuit
+    opens and calls fail immediately with CircuitOpenError. Once
+    `reset_timeout` has passed, up to `half_open_max_calls` probe calls are let
+    through; a successful probe closes the circuit, a failed one reopens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        slow_call_seconds: float = 5.0,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+        self.successes = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.short_circuited = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _reject_if_open(self) -> str:
+        state = self._current_state()
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_max_calls):
+            self.short_circuited += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        return state
+
+    def check(self) -> None:
+        """Raise CircuitOpenError if a call would be short-circuited right now."""
+        with self._lock:
+            self._reject_if_open()
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._reject_if_open() == HALF_OPEN:
+                self._probes += 1
+
+    def _trip(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self.times_opened += 1
+
+    def _record(self, ok: bool, duration: float) -> None:
+        slow = ok and duration >= self.slow_call_seconds
+
+        with self._lock:
+            if ok and not slow:
+                self.successes += 1
+                self._consecutive_failures = 0
+                self._state = CLOSED
+                return
+
+            if slow:
+                self.slow_calls += 1
+            else:
+                self.failures += 1
+            self._consecutive_failures += 1
+
+            if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._trip()
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call fn through the breaker."""
+        self._admit()
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self._record(False, time.monotonic() - started)
+            raise
+        self._record(True, time.monotonic() - started)
+        return result
+
+    async def acall(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Await fn through the breaker."""
+        self._admit()
+        started = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except BaseException:
+            # Cancellation counts too, so a cancelled half-open probe can't wedge the breaker
+            self._record(False, time.monotonic() - started)
+            raise
+        self._record(True, time.monotonic() - started)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+                "successes": self.successes,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "short_circuited": self.short_circuited,
+                "times_opened": self.times_opened
+            }
+
+_search_breaker: Optional[CircuitBreaker] = None
+_search_breaker_lock = threading.Lock()
+
+def get_search_breaker() -> CircuitBreaker:
+    """Return the circuit breaker shared by all web searches."""
+    global _search_breaker
+
+    if _search_breaker is None:
+        with _search_breaker_lock:
+            if _search_breaker is None:
+                _search_breaker = CircuitBreaker(
+                    "web_search",
+                    failure_threshold=int(os.getenv("SEARCH_BREAKER_FAILURES", "5")),
+                    slow_call_seconds=float(os.getenv("SEARCH_BREAKER_SLOW_SECONDS", "5")),
+                    reset_timeout=float(os.getenv("SEARCH_BREAKER_RESET_SECONDS", "30"))
+                )
+
+    return _search_breaker
@@ -0,0 +1,189 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from tools.search_canonical import canonicalize_query
+
+# Per-tool time-to-live for cached search results (seconds)
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+TOOL_TTLS: Dict[str, int] = {
+    # Crisis lookups change rarely but must never be badly stale
+    "find_crisis_resources": 24 * 60 * 60,
+    "search_crisis_hotlines": 24 * 60 * 60,
+    "crisis_resource_locator": 24 * 60 * 60,
+    "emergency_contact_finder": 24 * 60 * 60,
+
+    # Local directories and coverage details
+    "find_support_groups": 7 * 24 * 60 * 60,
+    "find_therapists": 7 * 24 * 60 * 60,
+    "community_resources": 7 * 24 * 60 * 60,
+    "insurance_navigator": 7 * 24 * 60 * 60,
+
+    # Educational and evidence-based material is close to static
+    "search_mental_health_resources": 30 * 24 * 60 * 60,
+    "search_medication_information": 30 * 24 * 60 * 60,
+    "search_treatment_options": 30 * 24 * 60 * 60,
+    "mental_health_education": 30 * 24 * 60 * 60,
+    "medication_information": 30 * 24 * 60 * 60,
+    "generate_cbt_exercise": 30 * 24 * 60 * 60,
+    "mindfulness_exercise_generator": 30 * 24 * 60 * 60,
+}
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query into its cache key (see canonicalize_query)."""
+    return canonicalize_query(query)
+
+class SearchCache:
+    """Persistent SQLite-backed TTL cache shared by all web search tools."""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 5000,
+        default_ttl: int = DEFAULT_TTL_SECONDS,
+        tool_ttls: Optional[Dict[str, int]] = None,
+        enabled: bool = True
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.tool_ttls = dict(TOOL_TTLS if tool_ttls is None else tool_ttls)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                tool TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache (last_access)"
+        )
+        self._size = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+    def ttl_for(self, tool_name: str) -> int:
+        """Return the TTL configured for a tool."""
+        return self.tool_ttls.get(tool_name, self.default_ttl)
+
+    def get(self, tool_name: str, query: str) -> Optional[Any]:
+        """Return the cached result for a query, or None on a miss or expiry."""
+        if not self.enabled:
+            return None
+
+        key = normalize_query(query)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, tool_name: str, query: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a search result under the tool's TTL."""
+        if not self.enabled:
+            return
+
+        key = normalize_query(query)
+        now = time.time()
+        expires_at = now + (self.ttl_for(tool_name) if ttl is None else ttl)
+        payload = json.dumps(value)
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO search_cache (key, tool, value, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, tool_name, payload, expires_at, now)
+            )
+            if cursor.rowcount:
+                self._size += 1
+            else:
+                self._conn.execute(
+                    "UPDATE search_cache SET tool = ?, value = ?, expires_at = ?, last_access = ? WHERE key = ?",
+                    (tool_name, payload, expires_at, now, key)
+                )
+
+            if self._size > self.max_entries:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones, to get back under the size bound."""
+        self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+        self._size = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+
+        # Evict in batches so eviction isn't paid on every insert
+        overflow = self._size - self.max_entries
+        if overflow > 0:
+            batch = overflow + max(self.max_entries // 10, 1)
+            cursor = self._conn.execute(
+                "DELETE FROM search_cache WHERE key IN (SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                (batch,)
+            )
+            self.evictions += cursor.rowcount
+            self._size -= cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": self._size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache, creating it on first use."""
+    global _search_cache
+
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchCache(
+                    path=os.getenv("SEARCH_CACHE_PATH", os.path.join(".cache", "search_cache.sqlite3")),
+                    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000")),
+                    default_ttl=int(os.getenv("SEARCH_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+                    enabled=os.getenv("SEARCH_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+                )
+
+    return _search_cache
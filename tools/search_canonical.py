@@ -0,0 +1,153 @@
+import re
+from typing import Dict
+
+from tools.search_backends import STOPWORDS
+
+# Spellings of the same place, mapped to one canonical "city st" form.
+# "new york" and "washington" on their own are the states (see
+# STATE_ABBREVIATIONS); the cities need "nyc", "new york city", "dc" and
+# the like. "la" is left alone: it's Los Angeles as often as Louisiana.
+LOCATION_ALIASES: Dict[str, str] = {
+    "nyc": "new york ny",
+    "new york city": "new york ny",
+    "new york city ny": "new york ny",
+    "new york ny": "new york ny",
+    "manhattan": "new york ny",
+    "los angeles": "los angeles ca",
+    "los angeles california": "los angeles ca",
+    "sf": "san francisco ca",
+    "san francisco": "san francisco ca",
+    "san francisco california": "san francisco ca",
+    "chicago": "chicago il",
+    "chicago illinois": "chicago il",
+    "philly": "philadelphia pa",
+    "philadelphia": "philadelphia pa",
+    "philadelphia pennsylvania": "philadelphia pa",
+    "houston": "houston tx",
+    "houston texas": "houston tx",
+    "washington dc": "washington dc",
+    "washington d c": "washington dc",
+    "dc": "washington dc",
+    "district of columbia": "washington dc",
+    "boston": "boston ma",
+    "boston massachusetts": "boston ma",
+    "atl": "atlanta ga",
+    "atlanta": "atlanta ga",
+    "atlanta georgia": "atlanta ga",
+    "seattle": "seattle wa",
+    "seattle washington": "seattle wa",
+    "usa": "united states",
+    "u s": "united states",
+    "u s a": "united states",
+    "america": "united states",
+    "nationwide": "national",
+}
+
+# The 50 state names and DC mapped to postal codes so "Austin, Texas" and "Austin TX" agree
+STATE_ABBREVIATIONS: Dict[str, str] = {
+    "alabama": "al", "alaska": "ak", "arizona": "az", "arkansas": "ar", "california": "ca",
+    "colorado": "co", "connecticut": "ct", "delaware": "de", "florida": "fl", "georgia": "ga",
+    "hawaii": "hi", "idaho": "id", "illinois": "il", "indiana": "in", "iowa": "ia",
+    "kansas": "ks", "kentucky": "ky", "louisiana": "la", "maine": "me", "maryland": "md",
+    "massachusetts": "ma", "michigan": "mi", "minnesota": "mn", "mississippi": "ms", "missouri": "mo",
+    "montana": "mt", "nebraska": "ne", "nevada": "nv", "new hampshire": "nh", "new jersey": "nj",
+    "new mexico": "nm", "new york": "ny", "north carolina": "nc", "north dakota": "nd", "ohio": "oh", "oklahoma": "ok",
+    "oregon": "or", "pennsylvania": "pa", "rhode island": "ri", "south carolina": "sc",
+    "south dakota": "sd", "tennessee": "tn", "texas": "tx", "utah": "ut", "vermont": "vt",
+    "virginia": "va", "washington": "wa", "west virginia": "wv", "wisconsin": "wi",
+    "wyoming": "wy", "district of columbia": "dc",
+}
+
+# Explicit state spellings of names that are also cities
+STATE_ALIASES: Dict[str, str] = {
+    "new york state": "new york",
+    "washington state": "washington",
+}
+
+# Different names for the same issue, mapped to one term
+ISSUE_SYNONYMS: Dict[str, str] = {
+    "anxious": "anxiety",
+    "anxiety disorder": "anxiety",
+    "anxiety disorders": "anxiety",
+    "generalized anxiety disorder": "anxiety",
+    "gad": "anxiety",
+    "depressed": "depression",
+    "depressive disorder": "depression",
+    "major depression": "depression",
+    "major depressive disorder": "depression",
+    "mdd": "depression",
+    "post traumatic stress": "ptsd",
+    "post traumatic stress disorder": "ptsd",
+    "post-traumatic stress": "ptsd",
+    "post-traumatic stress disorder": "ptsd",
+    "obsessive compulsive disorder": "ocd",
+    "obsessive-compulsive disorder": "ocd",
+    "attention deficit hyperactivity disorder": "adhd",
+    "attention deficit disorder": "adhd",
+    "bipolar disorder": "bipolar",
+    "manic depression": "bipolar",
+    "addiction": "substance use",
+    "substance abuse": "substance use",
+    "drug addiction": "substance use",
+    "alcoholism": "alcohol use",
+    "alcohol addiction": "alcohol use",
+    "alcohol abuse": "alcohol use",
+    "eating disorders": "eating disorder",
+    "bereavement": "grief",
+    "loss of a loved one": "grief",
+    "panic attacks": "panic disorder",
+    "panic attack": "panic disorder",
+    "therapist": "therapists",
+    "counselor": "counselors",
+    "support group": "support groups",
+}
+
+# Postal codes that are also common words or other abbreviations ("in", "or",
+# "me", "LA" for Los Angeles) are only folded when the state is spelled out
+AMBIGUOUS_STATE_CODES = frozenset(["al", "co", "de", "hi", "id", "in", "la", "ma", "me", "oh", "ok", "or", "pa"])
+
+def _state_token(code: str) -> str:
+    # Prefixed so a folded state can never be dropped as a stopword ("in", "or")
+    return f"state_{code}"
+
+_STATE_TOKENS: Dict[str, str] = {name: _state_token(code) for name, code in STATE_ABBREVIATIONS.items()}
+_STATE_TOKENS.update({
+    code: _state_token(code)
+    for code in set(STATE_ABBREVIATIONS.values()) - AMBIGUOUS_STATE_CODES
+})
+_STATE_TOKENS.update({alias: _STATE_TOKENS[name] for alias, name in STATE_ALIASES.items()})
+
+_LOCATION_TOKENS: Dict[str, str] = {}
+for _alias, _place in LOCATION_ALIASES.items():
+    _city, _, _code = _place.rpartition(" ")
+    if _code in STATE_ABBREVIATIONS.values():
+        _canonical = f"{_city} {_state_token(_code)}"
+        # "boston ma" and "boston" agree even though "ma" alone isn't folded
+        _LOCATION_TOKENS.setdefault(_place, _canonical)
+    else:
+        _canonical = _place
+    _LOCATION_TOKENS[_alias] = _canonical
+
+_PHRASES: Dict[str, str] = {**_STATE_TOKENS, **_LOCATION_TOKENS, **ISSUE_SYNONYMS}
+
+# Longest first so "new york city" wins over shorter overlapping phrases
+_PHRASE_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(phrase) for phrase in sorted(_PHRASES, key=len, reverse=True)) + r")\b"
+)
+
+# Drop punctuation except inside tokens like "24/7", "in-person" or "self-harm"
+_PUNCTUATION_RE = re.compile(r"(?<![\w])[-/]|[-/](?![\w])|[^\w\s/-]")
+
+def canonicalize_query(query: str) -> str:
+    """Map semantically identical search queries to one canonical key.
+
+    Lowercases, strips punctuation, folds location aliases, state names and
+    issue synonyms to canonical terms (states become "state_xx" tokens so
+    "Indiana" or "Oregon" survive stopword removal), then drops stopwords and duplicates
+    and sorts the remaining terms so word order doesn't matter. The result is
+    used as the cache and request-coalescing key; the web still receives the
+    original query.
+    """
+    text = " ".join(_PUNCTUATION_RE.sub(" ", query.lower()).split())
+    text = _PHRASE_RE.sub(lambda match: _PHRASES[match.group(0)], text)
+    return " ".join(sorted(set(token for token in text.split() if token not in STOPWORDS)))
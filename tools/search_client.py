@@ -0,0 +1,311 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from pydantic import PrivateAttr
+from langchain_community.utilities import GoogleSerperAPIWrapper
+
+from tools.search_backends import LocalIndexBackend, SearchBackend
+from tools.search_breaker import get_search_breaker
+from tools.search_cache import get_search_cache, normalize_query
+from tools.search_limits import get_search_limiter
+from tools.formulary import get_formulary
+from tools.provider_directory import get_provider_directory
+from tools.search_results import format_records, parse_serper_results, token_budget_for
+from tools.search_singleflight import SingleFlight
+
+SERPER_BASE_URL = "https://google.serper.dev"
+
+DEFAULT_LOCAL_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "search_corpus.jsonl")
+
+async def _close_on_loop_shutdown(session: aiohttp.ClientSession):
+    """Suspend until the event loop finalizes async generators, then close the session."""
+    try:
+        yield
+    finally:
+        await session.close()
+
+class PooledSerperAPIWrapper(GoogleSerperAPIWrapper):
+    """Serper wrapper that sends every request through one keep-alive connection pool."""
+
+    _session: Any = PrivateAttr(default=None)
+    _timeout: Tuple[float, float] = PrivateAttr(default=(3.05, 10.0))
+    _async_limit: int = PrivateAttr(default=100)
+    _aiosessions: Any = PrivateAttr(default_factory=weakref.WeakKeyDictionary)
+
+    def configure_pool(
+        self,
+        pool_maxsize: int,
+        connect_timeout: float,
+        read_timeout: float,
+        async_pool_maxsize: int = 100
+    ) -> None:
+        """Attach a pooled HTTP session with the given limits and timeouts."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=True)
+        session.mount("https://", adapter)
+        session.headers.update(self._headers())
+
+        self._session = session
+        self._timeout = (connect_timeout, read_timeout)
+        self._async_limit = async_pool_maxsize
+
+    def _headers(self) -> dict:
+        return {
+            "X-API-KEY": self.serper_api_key or "",
+            "Content-Type": "application/json"
+        }
+
+    async def _get_aiosession(self) -> aiohttp.ClientSession:
+        """Return the pooled aiohttp session for the running event loop.
+
+        The session is closed when the loop shuts down: asyncio.run() (or
+        loop.shutdown_asyncgens()) finalizes the guard generator started
+        here, whose cleanup closes it.
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._aiosessions.get(loop)
+
+        if entry is None or entry[0].closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._async_limit),
+                timeout=aiohttp.ClientTimeout(sock_connect=self._timeout[0], sock_read=self._timeout[1]),
+                headers=self._headers()
+            )
+            guard = _close_on_loop_shutdown(session)
+            # The first step registers the generator with the loop's shutdown hook
+            await guard.__anext__()
+            # The loop only tracks it weakly, so keep it alive with the session
+            entry = self._aiosessions[loop] = (session, guard)
+
+        return entry[0]
+
+    async def aclose(self) -> None:
+        """Close the aiohttp session bound to the running event loop now."""
+        entry = self._aiosessions.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    def _google_serper_api_results(self, search_term: str, search_type: str = "search", **kwargs: Any) -> dict:
+        params = {
+            "q": search_term,
+            **{key: value for key, value in kwargs.items() if value is not None}
+        }
+        response = self._session.post(
+            f"{SERPER_BASE_URL}/{search_type}",
+            params=params,
+            timeout=self._timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _async_google_serper_search_results(
+        self, search_term: str, search_type: str = "search", **kwargs: Any
+    ) -> dict:
+        params = {
+            "q": search_term,
+            **{key: value for key, value in kwargs.items() if value is not None}
+        }
+        session = await self._get_aiosession()
+        async with session.post(
+            f"{SERPER_BASE_URL}/{search_type}",
+            params=params,
+            raise_for_status=True
+        ) as response:
+            return await response.json()
+
+_search_client: Optional[PooledSerperAPIWrapper] = None
+_search_client_lock = threading.Lock()
+
+def get_search_client() -> PooledSerperAPIWrapper:
+    """Return the process-wide search client, creating it on first use.
+
+    Pool sizes and timeouts come from SEARCH_POOL_MAXSIZE, SEARCH_ASYNC_POOL_MAXSIZE,
+    SEARCH_CONNECT_TIMEOUT and SEARCH_READ_TIMEOUT.
+    """
+    global _search_client
+
+    if _search_client is None:
+        with _search_client_lock:
+            if _search_client is None:
+                client = PooledSerperAPIWrapper()
+                client.configure_pool(
+                    pool_maxsize=int(os.getenv("SEARCH_POOL_MAXSIZE", "32")),
+                    connect_timeout=float(os.getenv("SEARCH_CONNECT_TIMEOUT", "3.05")),
+                    read_timeout=float(os.getenv("SEARCH_READ_TIMEOUT", "10")),
+                    async_pool_maxsize=int(os.getenv("SEARCH_ASYNC_POOL_MAXSIZE", "100"))
+                )
+                _search_client = client
+
+    return _search_client
+
+class SerperSearchBackend(SearchBackend):
+    """Web search backend backed by the shared pooled Serper client."""
+
+    name = "serper"
+
+    def search(self, query: str) -> Optional[List[Dict[str, str]]]:
+        return parse_serper_results(get_search_client().results(query))
+
+    async def asearch(self, query: str) -> Optional[List[Dict[str, str]]]:
+        return parse_serper_results(await get_search_client().aresults(query))
+
+class SearchUnavailableError(RuntimeError):
+    """Raised when no backend could answer a search."""
+
+_web_backend: Optional[SearchBackend] = None
+_local_backend: Optional[SearchBackend] = None
+_backends_loaded = False
+_backends_lock = threading.Lock()
+
+def _load_backends() -> None:
+    """Create the configured backends on first use.
+
+    SEARCH_OFFLINE=true disables the web backend; LOCAL_SEARCH_CORPUS lists
+    corpus files or directories (os.pathsep separated) for the local index.
+    """
+    global _web_backend, _local_backend, _backends_loaded
+
+    if _backends_loaded:
+        return
+
+    with _backends_lock:
+        if _backends_loaded:
+            return
+
+        if _web_backend is None and os.getenv("SEARCH_OFFLINE", "false").lower() not in ("1", "true", "yes"):
+            _web_backend = SerperSearchBackend()
+
+        if _local_backend is None:
+            corpus_paths = [path for path in os.getenv("LOCAL_SEARCH_CORPUS", DEFAULT_LOCAL_CORPUS).split(os.pathsep) if path]
+            if corpus_paths and all(os.path.exists(path) for path in corpus_paths):
+                _local_backend = LocalIndexBackend.from_paths(corpus_paths)
+
+        _backends_loaded = True
+
+def set_search_backends(web: Optional[SearchBackend] = None, local: Optional[SearchBackend] = None) -> None:
+    """Replace the web and/or local search backends (e.g. for offline runs or tests)."""
+    global _web_backend, _local_backend, _backends_loaded
+
+    with _backends_lock:
+        _web_backend = web
+        _local_backend = local
+        _backends_loaded = True
+
+def get_web_backend() -> Optional[SearchBackend]:
+    _load_backends()
+    return _web_backend
+
+def get_local_backend() -> Optional[SearchBackend]:
+    _load_backends()
+    return _local_backend
+
+def _web_search(query: str) -> List[Dict[str, str]]:
+    backend = get_web_backend()
+    if backend is None:
+        raise SearchUnavailableError(f"No web search backend available for: {query}")
+    return get_search_breaker().call(backend.search, query)
+
+async def _aweb_search(query: str) -> List[Dict[str, str]]:
+    backend = get_web_backend()
+    if backend is None:
+        raise SearchUnavailableError(f"No web search backend available for: {query}")
+    return await get_search_breaker().acall(backend.asearch, query)
+
+# Identical searches in flight at the same moment share one upstream request
+_search_flights = SingleFlight()
+
+def search_records(
+    query: str,
+    tool_name: str,
+    bypass_cache: bool = False,
+    local_first: bool = False
+) -> List[Dict[str, str]]:
+    """Run a search through the shared cache and backends and return result records.
+
+    With local_first=True the local index is tried first and the web is only
+    used on a miss. With bypass_cache=True the cached entry is ignored and
+    refreshed with a live result.
+    """
+    if local_first:
+        local = get_local_backend()
+        records = local.search(query) if local is not None else None
+        if records is not None:
+            return records
+
+    cache = get_search_cache()
+
+    if not bypass_cache:
+        cached = cache.get(tool_name, query)
+        # Entries written before results were stored as records are ignored
+        if isinstance(cached, list):
+            return cached
+
+    def fetch() -> List[Dict[str, str]]:
+        # Fail fast during an outage without spending rate-limit budget
+        get_search_breaker().check()
+        get_search_limiter().acquire()
+        records = _web_search(query)
+        cache.set(tool_name, query, records)
+        return records
+
+    return _search_flights.do(normalize_query(query), fetch)
+
+async def asearch_records(
+    query: str,
+    tool_name: str,
+    bypass_cache: bool = False,
+    local_first: bool = False
+) -> List[Dict[str, str]]:
+    """Async variant of search_records that never blocks the event loop on the network."""
+    if local_first:
+        local = get_local_backend()
+        records = await local.asearch(query) if local is not None else None
+        if records is not None:
+            return records
+
+    cache = get_search_cache()
+
+    if not bypass_cache:
+        cached = cache.get(tool_name, query)
+        if isinstance(cached, list):
+            return cached
+
+    async def fetch() -> List[Dict[str, str]]:
+        get_search_breaker().check()
+        await get_search_limiter().aacquire()
+        records = await _aweb_search(query)
+        cache.set(tool_name, query, records)
+        return records
+
+    return await _search_flights.ado(normalize_query(query), fetch)
+
+def run_search(query: str, tool_name: str, bypass_cache: bool = False, local_first: bool = False) -> str:
+    """Search and return compact result text trimmed to the tool's token budget."""
+    records = search_records(query, tool_name, bypass_cache=bypass_cache, local_first=local_first)
+    return format_records(records, token_budget_for(tool_name))
+
+async def arun_search(query: str, tool_name: str, bypass_cache: bool = False, local_first: bool = False) -> str:
+    """Async variant of run_search."""
+    records = await asearch_records(query, tool_name, bypass_cache=bypass_cache, local_first=local_first)
+    return format_records(records, token_budget_for(tool_name))
+
+def search_stats() -> Dict[str, Any]:
+    """Return counters for the search layer: local index, provider directory, formulary, cache, coalescing, limits and circuit breaker."""
+    local = get_local_backend()
+    directory = get_provider_directory()
+    formulary = get_formulary()
+    return {
+        "local_index": local.stats() if local is not None else None,
+        "provider_directory": directory.stats() if directory is not None else None,
+        "formulary": formulary.stats() if formulary is not None else None,
+        "cache": get_search_cache().stats(),
+        "coalescing": _search_flights.stats(),
+        "limits": get_search_limiter().stats(),
+        "circuit_breaker": get_search_breaker().stats()
+    }
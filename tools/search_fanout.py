@@ -0,0 +1,48 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Optional
+
+from tools.search_client import search_records
+from tools.search_results import dedupe_records, format_records, token_budget_for
+
+# Shared pool so concurrent tool calls don't each spin up their own threads
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SEARCH_FANOUT_WORKERS", "16")),
+    thread_name_prefix="search-fanout"
+)
+
+def fan_out_searches(
+    queries: Dict[str, str],
+    tool_name: str,
+    deadline: float,
+    fallback: Optional[str] = None,
+    local_first: bool = False
+) -> Dict[str, Optional[str]]:
+    """Run several searches concurrently and return whatever finished before the deadline.
+
+    Searches that fail or are still running at the deadline map to `fallback`
+    instead of failing the whole tool call. Results are deduplicated across
+    sub-queries and the tool's token budget is split evenly between them.
+    """
+    # Copy the caller's context so sub-searches count against its session and turn budgets
+    futures = {
+        name: _executor.submit(
+            contextvars.copy_context().run, search_records, query, tool_name, local_first=local_first
+        )
+        for name, query in queries.items()
+    }
+
+    wait(futures.values(), timeout=deadline)
+
+    section_budget = max(token_budget_for(tool_name) // max(len(queries), 1), 1)
+    seen = set()
+    results = {}
+    for name, future in futures.items():
+        if future.done() and future.exception() is None:
+            results[name] = format_records(dedupe_records(future.result(), seen), section_budget)
+        else:
+            # Late searches keep running and still populate the cache for next time
+            results[name] = fallback
+
+    return results
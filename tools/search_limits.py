@@ -0,0 +1,182 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+class SearchBudgetExceeded(RuntimeError):
+    """Raised when a web search would exceed the rate limit or a call budget.
+
+    Tools treat it like any other search failure and return their static
+    fallback text.
+    """
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of blocking."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float, keep: float = 0.0) -> Optional[float]:
+        """Reserve one token; return how long to wait for it, or None if that exceeds max_wait.
+
+        `keep` tokens are left untouched, e.g. so background work can't use
+        the capacity held back for interactive requests.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            available = self._tokens - keep
+            wait = 0.0 if available >= 1 else (1 - available) / self.rate
+            if wait > max_wait:
+                return None
+
+            self._tokens -= 1
+            return wait
+
+class _TurnScope:
+    def __init__(self, session_id: Optional[str]):
+        self.session_id = session_id
+        self.calls = 0
+
+_current_turn: ContextVar[Optional[_TurnScope]] = ContextVar("search_turn", default=None)
+_background: ContextVar[bool] = ContextVar("search_background", default=False)
+
+class SearchLimiter:
+    """Process-wide rate limit plus per-session and per-turn web search budgets.
+
+    Searches made in a background() scope (cache warm-up) never wait and
+    never take the last `background_reserve` tokens, so they can't
+    rate-limit users.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 10.0,
+        burst: int = 20,
+        max_wait: float = 0.5,
+        session_budget: int = 100,
+        turn_budget: int = 12,
+        max_tracked_sessions: int = 10000,
+        background_reserve: Optional[float] = None
+    ):
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.max_wait = max_wait
+        self.background_reserve = burst / 2 if background_reserve is None else background_reserve
+        self.session_budget = session_budget
+        self.turn_budget = turn_budget
+        self.max_tracked_sessions = max_tracked_sessions
+
+        self._lock = threading.Lock()
+        self._session_calls: "OrderedDict[str, int]" = OrderedDict()
+        self.allowed = 0
+        self.rejected = {"rate": 0, "session": 0, "turn": 0, "background": 0}
+
+    def _reserve(self) -> float:
+        """Check budgets and reserve a rate-limit token; return the wait before calling out."""
+        turn = _current_turn.get()
+
+        with self._lock:
+            if turn is not None and turn.calls >= self.turn_budget:
+                self.rejected["turn"] += 1
+                raise SearchBudgetExceeded(f"Per-turn search budget of {self.turn_budget} exhausted")
+
+            session_id = turn.session_id if turn is not None else None
+            if session_id is not None and self._session_calls.get(session_id, 0) >= self.session_budget:
+                self.rejected["session"] += 1
+                raise SearchBudgetExceeded(f"Per-session search budget of {self.session_budget} exhausted")
+
+            if _background.get():
+                if self.bucket.reserve(0.0, keep=self.background_reserve) is None:
+                    self.rejected["background"] += 1
+                    raise SearchBudgetExceeded("Search capacity is held for interactive requests")
+                wait = 0.0
+            else:
+                wait = self.bucket.reserve(self.max_wait)
+                if wait is None:
+                    self.rejected["rate"] += 1
+                    raise SearchBudgetExceeded("Search rate limit exceeded")
+
+            if turn is not None:
+                turn.calls += 1
+            if session_id is not None:
+                self._session_calls[session_id] = self._session_calls.get(session_id, 0) + 1
+                self._session_calls.move_to_end(session_id)
+                if len(self._session_calls) > self.max_tracked_sessions:
+                    self._session_calls.popitem(last=False)
+            self.allowed += 1
+
+        return wait
+
+    def acquire(self) -> None:
+        """Admit one web search, waiting briefly for rate-limit capacity if needed."""
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self) -> None:
+        """Async variant of acquire that waits without blocking the event loop."""
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    @contextmanager
+    def turn(self, session_id: Optional[str]) -> Iterator[None]:
+        """Scope the searches made while handling one conversation turn."""
+        token = _current_turn.set(_TurnScope(session_id))
+        try:
+            yield
+        finally:
+            _current_turn.reset(token)
+
+    @contextmanager
+    def background(self) -> Iterator[None]:
+        """Scope searches that must yield to interactive requests (see the class docstring)."""
+        token = _background.set(True)
+        try:
+            yield
+        finally:
+            _background.reset(token)
+
+    def end_session(self, session_id: str) -> None:
+        """Forget the search count of a finished session."""
+        with self._lock:
+            self._session_calls.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "allowed": self.allowed,
+                "rejected": dict(self.rejected),
+                "tracked_sessions": len(self._session_calls)
+            }
+
+_search_limiter: Optional[SearchLimiter] = None
+_search_limiter_lock = threading.Lock()
+
+def get_search_limiter() -> SearchLimiter:
+    """Return the process-wide search limiter, creating it on first use."""
+    global _search_limiter
+
+    if _search_limiter is None:
+        with _search_limiter_lock:
+            if _search_limiter is None:
+                _search_limiter = SearchLimiter(
+                    rate_per_second=float(os.getenv("SEARCH_RATE_PER_SECOND", "10")),
+                    burst=int(os.getenv("SEARCH_RATE_BURST", "20")),
+                    max_wait=float(os.getenv("SEARCH_RATE_MAX_WAIT", "0.5")),
+                    session_budget=int(os.getenv("SEARCH_SESSION_BUDGET", "100")),
+                    turn_budget=int(os.getenv("SEARCH_TURN_BUDGET", "12")),
+                    background_reserve=float(os.getenv("SEARCH_BACKGROUND_RESERVE")) if os.getenv("SEARCH_BACKGROUND_RESERVE") else None
+                )
+
+    return _search_limiter
@@ -0,0 +1,120 @@
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Rough prompt-token budget for the search text a tool hands back to the LLM
+DEFAULT_TOKEN_BUDGET = int(os.getenv("SEARCH_TOKEN_BUDGET", "400"))
+
+TOOL_TOKEN_BUDGETS: Dict[str, int] = {
+    # Fan-out tools share one budget across all of their sub-queries
+    "generate_cbt_exercise": 1000,
+    "mindfulness_exercise_generator": 1000,
+}
+
+MAX_SNIPPET_CHARS = 300
+
+NO_RESULTS = "No search results found."
+
+class DegradedResult(str):
+    """Static fallback text a tool returned because search failed, was rate-limited or its circuit was open.
+
+    It reads like any other tool result, but it isn't memoized, so the next
+    call in the session tries the search again.
+    """
+
+def degraded(text: str) -> DegradedResult:
+    """Mark a tool's fallback text as degraded."""
+    return DegradedResult(text)
+
+def is_degraded(result: Any) -> bool:
+    """Whether a tool result is fallback text or has sections whose searches failed ("unavailable_sections")."""
+    if isinstance(result, DegradedResult):
+        return True
+    return isinstance(result, dict) and bool(result.get("unavailable_sections"))
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) for budgeting."""
+    return (len(text) + 3) // 4
+
+def token_budget_for(tool_name: str) -> int:
+    """Return the search-result token budget configured for a tool."""
+    return TOOL_TOKEN_BUDGETS.get(tool_name, DEFAULT_TOKEN_BUDGET)
+
+def make_record(title: Any, url: Any, snippet: Any) -> Dict[str, str]:
+    """Build a compact result record with whitespace collapsed and the snippet capped."""
+    snippet = " ".join(str(snippet or "").split())
+    if len(snippet) > MAX_SNIPPET_CHARS:
+        snippet = snippet[:MAX_SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+
+    return {
+        "title": " ".join(str(title or "").split()),
+        "url": str(url or ""),
+        "snippet": snippet
+    }
+
+def parse_serper_results(results: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Parse a raw Serper response into title/url/snippet records."""
+    records = []
+
+    answer_box = results.get("answerBox")
+    if answer_box:
+        records.append(make_record(
+            answer_box.get("title"),
+            answer_box.get("link"),
+            answer_box.get("answer") or answer_box.get("snippet") or answer_box.get("snippetHighlighted")
+        ))
+
+    knowledge_graph = results.get("knowledgeGraph")
+    if knowledge_graph:
+        records.append(make_record(
+            knowledge_graph.get("title"),
+            knowledge_graph.get("descriptionLink") or knowledge_graph.get("website"),
+            knowledge_graph.get("description")
+        ))
+
+    for item in results.get("organic", []):
+        records.append(make_record(item.get("title"), item.get("link"), item.get("snippet")))
+
+    return [record for record in records if record["snippet"] or record["title"]]
+
+def _record_key(record: Dict[str, str]) -> str:
+    return record["url"].rstrip("/").lower() or record["snippet"].lower()
+
+def dedupe_records(records: Iterable[Dict[str, str]], seen: Optional[Set[str]] = None) -> List[Dict[str, str]]:
+    """Drop records already seen (by URL, or snippet when there is no URL).
+
+    Pass the same `seen` set across calls to deduplicate across sub-queries.
+    """
+    seen = set() if seen is None else seen
+    unique = []
+
+    for record in records:
+        key = _record_key(record)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(record)
+
+    return unique
+
+def format_record(record: Dict[str, str]) -> str:
+    source = f" ({record['url']})" if record["url"] else ""
+    title = f"{record['title']}: " if record["title"] else ""
+    return f"- {title}{record['snippet']}{source}"
+
+def format_records(records: List[Dict[str, str]], max_tokens: int) -> str:
+    """Render records one per line, stopping before the token budget is exceeded."""
+    lines = []
+    used = 0
+
+    for record in records:
+        line = format_record(record)
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            if not lines:
+                # Always return something useful, even if the first record is long
+                lines.append(line[:max_tokens * 4])
+            break
+        lines.append(line)
+        used += cost
+
+    return "\n".join(lines) if lines else NO_RESULTS
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one outstanding execution.
+
+    The first caller for a key runs the work; callers that arrive while it is
+    still in flight wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._async_calls: Dict[Tuple[int, str], asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn once per key across concurrent threads."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn once per key across concurrent tasks on the running event loop."""
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+
+        with self._lock:
+            task = self._async_calls.get(call_key)
+            if task is None:
+                task = loop.create_task(fn())
+                self._async_calls[call_key] = task
+                task.add_done_callback(lambda _: self._forget(call_key))
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        # Shield so one cancelled waiter doesn't cancel the shared request
+        return await asyncio.shield(task)
+
+    def _forget(self, call_key: Tuple[int, str]) -> None:
+        with self._lock:
+            self._async_calls.pop(call_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how many calls executed and how many were coalesced onto them."""
+        with self._lock:
+            in_flight = len(self._calls) + len(self._async_calls)
+
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": in_flight
+        }
@@ -1,13 +1,13 @@
 from langchain.tools import tool
-from langchain_community.utilities import GoogleSerperAPIWrapper
+from tools.search_client import run_search, arun_search
+from tools.search_results import degraded
+from tools.formulary import local_medication_information
+from tools.provider_directory import get_provider_directory, format_support_group, format_therapist
+from typing import Optional
 import os
 
-# Initialize search wrapper
-search_wrapper = GoogleSerperAPIWrapper()
-
-@tool
-def find_support_groups(location: str, issue_type: str, format_preference: str = "both") -> str:
-    """Find local and online support groups for specific mental health issues."""
+def _support_groups_query(location: str, issue_type: str, format_preference: str) -> str:
+    """Build the support group search query."""
     
     format_query = ""
     if format_preference == "online":
@@ -17,69 +17,191 @@ def find_support_groups(location: str, issue_type: str, format_preference: str =
     else:
         format_query = "online virtual local in-person"
     
-    query = f"{format_query} support groups {issue_type} {location} mental health community peer support"
+    return f"{format_query} support groups {issue_type} {location} mental health community peer support"
+
+def _support_groups_fallback(location: str, issue_type: str) -> str:
+    """Text to return when the support group search is unavailable."""
+    
+    return degraded(f"Unable to search for support groups at this time. Please try contacting local mental health organizations or searching online for '{issue_type} support groups {location}'.")
+
+def _therapists_query(location: str, specialization: str, insurance: str) -> str:
+    """Build the therapist search query."""
+    
+    insurance_query = f"{insurance} insurance" if insurance != "any" else "insurance accepted"
+    return f"licensed therapists {specialization} {location} {insurance_query} mental health counselors psychologists"
+
+def _therapists_fallback() -> str:
+    """Text to return when the therapist search is unavailable."""
+    
+    return degraded("Unable to search for therapists at this time. Consider contacting your insurance provider or visiting Psychology Today's therapist directory.")
+
+def _mental_health_resources_query(topic: str) -> str:
+    """Build the mental health resources search query."""
+    
+    return f"mental health resources {topic} educational materials support information evidence-based treatment"
+
+def _mental_health_resources_fallback(topic: str) -> str:
+    """Text to return when the resource search is unavailable."""
+    
+    return degraded(f"Unable to search for resources at this time. Consider visiting reputable sites like NAMI.org, MentalHealth.gov, or NIMH.nih.gov for {topic} information.")
+
+def _crisis_hotlines_query(location: str) -> str:
+    """Build the crisis hotline search query."""
+    
+    if location == "national":
+        return "national crisis hotlines mental health emergency suicide prevention 24/7"
+    return f"crisis hotlines {location} local emergency mental health services suicide prevention"
+
+def _local_support_groups(location: str, issue_type: str, format_preference: str) -> Optional[str]:
+    """Look up support groups in the local provider directory; None when it has no matches."""
+    
+    directory = get_provider_directory()
+    if directory is None:
+        return None
+    
+    try:
+        rows = directory.find_support_groups(location, issue_type, format_preference)
+    except Exception:
+        return None
+    if not rows:
+        return None
+    
+    listings = "\n".join(format_support_group(row) for row in rows)
+    return f"Support groups for {issue_type} in {location} ({format_preference} format) from the local directory:\n{listings}"
+
+def _local_therapists(location: str, specialization: str, insurance: str) -> Optional[str]:
+    """Look up therapists in the local provider directory; None when it has no matches."""
+    
+    directory = get_provider_directory()
+    if directory is None:
+        return None
+    
+    try:
+        rows = directory.find_therapists(location, specialization, insurance)
+    except Exception:
+        return None
+    if not rows:
+        return None
+    
+    listings = "\n".join(format_therapist(row) for row in rows)
+    return f"Licensed therapists specializing in {specialization} in {location} from the local directory:\n{listings}"
+
+@tool
+def find_support_groups(location: str, issue_type: str, format_preference: str = "both") -> str:
+    """Find local and online support groups for specific mental health issues."""
+    
+    local = _local_support_groups(location, issue_type, format_preference)
+    if local is not None:
+        return local
+    
+    query = _support_groups_query(location, issue_type, format_preference)
+    
+    try:
+        results = run_search(query, "find_support_groups")
+        return f"Support groups for {issue_type} in {location} ({format_preference} format):\n{results}"
+    except Exception:
+        return _support_groups_fallback(location, issue_type)
+
+async def _afind_support_groups(location: str, issue_type: str, format_preference: str = "both") -> str:
+    local = _local_support_groups(location, issue_type, format_preference)
+    if local is not None:
+        return local
+    
+    query = _support_groups_query(location, issue_type, format_preference)
     
     try:
-        results = search_wrapper.run(query)
+        results = await arun_search(query, "find_support_groups")
         return f"Support groups for {issue_type} in {location} ({format_preference} format):\n{results}"
-    except Exception as e:
-        return f"Unable to search for support groups at this time. Please try contacting local mental health organizations or searching online for '{issue_type} support groups {location}'."
+    except Exception:
+        return _support_groups_fallback(location, issue_type)
+
+find_support_groups.coroutine = _afind_support_groups
 
 @tool
 def find_therapists(location: str, specialization: str, insurance: str = "any") -> str:
     """Find licensed therapists and mental health professionals in the area."""
     
-    insurance_query = f"{insurance} insurance" if insurance != "any" else "insurance accepted"
-    query = f"licensed therapists {specialization} {location} {insurance_query} mental health counselors psychologists"
+    local = _local_therapists(location, specialization, insurance)
+    if local is not None:
+        return local
+    
+    query = _therapists_query(location, specialization, insurance)
     
     try:
-        results = search_wrapper.run(query)
+        results = run_search(query, "find_therapists")
         return f"Licensed therapists specializing in {specialization} in {location}:\n{results}"
-    except Exception as e:
-        return f"Unable to search for therapists at this time. Consider contacting your insurance provider or visiting Psychology Today's therapist directory."
+    except Exception:
+        return _therapists_fallback()
+
+async def _afind_therapists(location: str, specialization: str, insurance: str = "any") -> str:
+    local = _local_therapists(location, specialization, insurance)
+    if local is not None:
+        return local
+    
+    query = _therapists_query(location, specialization, insurance)
+    
+    try:
+        results = await arun_search(query, "find_therapists")
+        return f"Licensed therapists specializing in {specialization} in {location}:\n{results}"
+    except Exception:
+        return _therapists_fallback()
+
+find_therapists.coroutine = _afind_therapists
 
 @tool
 def search_mental_health_resources(topic: str) -> str:
     """Search for comprehensive mental health resources, educational materials, and support information."""
     
-    query = f"mental health resources {topic} educational materials support information evidence-based treatment"
+    query = _mental_health_resources_query(topic)
+    
+    try:
+        results = run_search(query, "search_mental_health_resources", local_first=True)
+        return f"Mental health resources and information about {topic}:\n{results}"
+    except Exception:
+        return _mental_health_resources_fallback(topic)
+
+async def _asearch_mental_health_resources(topic: str) -> str:
+    query = _mental_health_resources_query(topic)
     
     try:
-        results = search_wrapper.run(query)
+        results = await arun_search(query, "search_mental_health_resources", local_first=True)
         return f"Mental health resources and information about {topic}:\n{results}"
-    except Exception as e:
-        return f"Unable to search for resources at this time. Consider visiting reputable sites like NAMI.org, MentalHealth.gov, or NIMH.nih.gov for {topic} information."
+    except Exception:
+        return _mental_health_resources_fallback(topic)
+
+search_mental_health_resources.coroutine = _asearch_mental_health_resources
 
 @tool
 def search_crisis_hotlines(location: str = "national") -> str:
     """Search for crisis hotlines and emergency mental health services."""
     
-    if location == "national":
-        query = "national crisis hotlines mental health emergency suicide prevention 24/7"
-    else:
-        query = f"crisis hotlines {location} local emergency mental health services suicide prevention"
+    query = _crisis_hotlines_query(location)
     
     try:
-        results = search_wrapper.run(query)
+        results = run_search(query, "search_crisis_hotlines", local_first=location == "national")
         return f"Crisis hotlines and emergency services ({location}):\n{results}"
-    except Exception as e:
-        return """National Crisis Resources:
+    except Exception:
+        return degraded("""National Crisis Resources:
         - National Suicide Prevention Lifeline: 988
         - Crisis Text Line: Text HOME to 741741
         - SAMHSA National Helpline: 1-800-662-4357
-        - If in immediate danger, call 911"""
+        - If in immediate danger, call 911""")
 
 @tool
 def search_medication_information(medication_name: str) -> str:
     """Search for general information about psychiatric medications."""
     
+    local = local_medication_information(medication_name)
+    if local is not None:
+        return f"{local}\n\nIMPORTANT: Always consult with your prescribing physician about medications."
+    
     query = f"{medication_name} psychiatric medication information side effects patient education FDA approved"
     
     try:
-        results = search_wrapper.run(query)
+        results = run_search(query, "search_medication_information")
         return f"General information about {medication_name}:\n{results}\n\nIMPORTANT: Always consult with your prescribing physician about medications."
-    except Exception as e:
-        return f"Unable to search for medication information. Please consult your prescribing physician, pharmacist, or visit FDA.gov for information about {medication_name}."
+    except Exception:
+        return degraded(f"Unable to search for medication information. Please consult your prescribing physician, pharmacist, or visit FDA.gov for information about {medication_name}.")
 
 @tool
 def search_treatment_options(condition: str, location: str = "general") -> str:
@@ -91,7 +213,7 @@ def search_treatment_options(condition: str, location: str = "general") -> str:
         query = f"treatment options {condition} {location} mental health services therapy evidence-based"
     
     try:
-        results = search_wrapper.run(query)
+        results = run_search(query, "search_treatment_options", local_first=location == "general")
         return f"Treatment options for {condition}:\n{results}"
-    except Exception as e:
-        return f"Unable to search for treatment options. Consider consulting with a mental health professional about evidence-based treatments for {condition}."
+    except Exception:
+        return degraded(f"Unable to search for treatment options. Consider consulting with a mental health professional about evidence-based treatments for {condition}.")
@@ -0,0 +1,102 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tools.crisis_tools import _crisis_resources_query
+from tools.resource_tools import _crisis_locator_query
+from tools.search_breaker import CircuitOpenError
+from tools.search_client import search_records
+from tools.search_limits import SearchBudgetExceeded, get_search_limiter
+from tools.search_tools import _crisis_hotlines_query
+
+def warmup_queries(locations: Iterable[str], crisis_types: Iterable[str]) -> List[Tuple[str, str]]:
+    """Return the (tool_name, query) pairs the crisis tools would search for these locations."""
+    crisis_types = list(crisis_types)
+    queries = []
+
+    for location in locations:
+        queries.append(("find_crisis_resources", _crisis_resources_query(location)))
+        queries.append(("search_crisis_hotlines", _crisis_hotlines_query(location)))
+        for crisis_type in crisis_types:
+            queries.append(("crisis_resource_locator", _crisis_locator_query(location, crisis_type)))
+
+    return queries
+
+# Pause before retrying a query that was refused to leave room for users
+BUSY_BACKOFF_SECONDS = 5.0
+
+def warm_search_cache(
+    locations: Iterable[str],
+    crisis_types: Iterable[str],
+    refresh: bool = False,
+    pace_seconds: float = 0.0
+) -> Dict[str, int]:
+    """Prefetch crisis tool searches into the search cache.
+
+    Entries already cached are left alone unless refresh=True, in which case
+    they are re-fetched so they never expire between runs. Searches run in
+    the limiter's background scope, so they never take the capacity held for
+    users, and are spaced `pace_seconds` apart. A query refused for lack of
+    capacity is retried once after a pause; if it's refused again, or the
+    search API is unavailable, the run stops and the next one tries again.
+    """
+    queries = warmup_queries(locations, crisis_types)
+    stats = {"queries": len(queries), "fetched": 0, "failed": 0}
+
+    with get_search_limiter().background():
+        for index, (tool_name, query) in enumerate(queries):
+            if index and pace_seconds > 0 and _warmup_stop.wait(pace_seconds):
+                break
+            try:
+                try:
+                    search_records(query, tool_name, bypass_cache=refresh)
+                except SearchBudgetExceeded:
+                    if _warmup_stop.wait(BUSY_BACKOFF_SECONDS):
+                        raise
+                    search_records(query, tool_name, bypass_cache=refresh)
+                stats["fetched"] += 1
+            except (CircuitOpenError, SearchBudgetExceeded):
+                stats["failed"] += len(queries) - stats["fetched"] - stats["failed"]
+                break
+            except Exception:
+                stats["failed"] += 1
+
+    return stats
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+_warmup_stop = threading.Event()
+
+def start_search_warmup(
+    locations: Iterable[str],
+    crisis_types: Iterable[str],
+    interval_seconds: float,
+    pace_seconds: float = 0.0
+) -> threading.Thread:
+    """Warm the search cache in a background thread, then refresh it every interval.
+
+    Only one warm-up thread runs per process; later calls return the running one.
+    """
+    global _warmup_thread
+
+    locations = list(locations)
+    crisis_types = list(crisis_types)
+
+    def run() -> None:
+        refresh = False
+        while not _warmup_stop.is_set():
+            warm_search_cache(locations, crisis_types, refresh=refresh, pace_seconds=pace_seconds)
+            refresh = True
+            if interval_seconds <= 0 or _warmup_stop.wait(interval_seconds):
+                break
+
+    with _warmup_lock:
+        if _warmup_thread is None or not _warmup_thread.is_alive():
+            _warmup_stop.clear()
+            _warmup_thread = threading.Thread(target=run, name="search-warmup", daemon=True)
+            _warmup_thread.start()
+
+    return _warmup_thread
+
+def stop_search_warmup() -> None:
+    """Stop the background warm-up thread after its current run."""
+    _warmup_stop.set()
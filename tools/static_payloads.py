@@ -0,0 +1,48 @@
+from functools import lru_cache
+from typing import Any, Callable, TypeVar
+
+# Bound on each static tool's memo of argument-dependent results
+MEMO_SIZE = 256
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+def _read_only(self, *args: Any, **kwargs: Any) -> None:
+    raise TypeError("Static tool payloads are shared between calls and cannot be modified")
+
+class FrozenDict(dict):
+    """Read-only dict for constant tool content built once at import.
+
+    Subclasses dict so tool results still print and serialize exactly like
+    plain dicts.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+class FrozenList(list):
+    """Read-only list counterpart of FrozenDict."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into their read-only counterparts."""
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+def normalize_arg(value: Any) -> str:
+    """Normalize a free-text tool argument for use as a memo key."""
+    return " ".join(str(value).lower().split())
+
+def memoized(fn: F) -> F:
+    """Bounded LRU memo for the argument-dependent part of a static tool."""
+    return lru_cache(maxsize=MEMO_SIZE)(fn)
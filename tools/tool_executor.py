@@ -0,0 +1,105 @@
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from tools.result_encoder import encode_tool_result
+from tools.tool_memo import memo_key, memo_lookup, memo_store
+
+# Seconds one tool call may take before its result is given up on
+DEFAULT_TOOL_TIMEOUT = float(os.getenv("TOOL_CALL_TIMEOUT", "20"))
+
+# Shared pool so the tool calls of one LLM round run side by side
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("TOOL_CALL_WORKERS", "8")),
+    thread_name_prefix="tool-call"
+)
+
+def tool_spec(tool: Any, label: str, defaults: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Describe how an agent runs a tool: its result label, argument defaults and timeout."""
+    return {"tool": tool, "label": label, "defaults": defaults or {}, "timeout": timeout or DEFAULT_TOOL_TIMEOUT}
+
+def _tool_args(spec: Dict[str, Any], call_args: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply the spec's defaults and drop arguments the tool doesn't take."""
+    accepted = spec["tool"].args
+    return {**spec["defaults"], **{name: value for name, value in call_args.items() if name in accepted}}
+
+def run_tool_calls(
+    tool_calls: List[Dict[str, Any]],
+    specs: Dict[str, Dict[str, Any]],
+    memo: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Run one round of LLM tool calls concurrently and return one result per call, in call order.
+
+    Session-memoized results are reused and identical calls in the round run
+    once. Every call gets a result carrying its tool_call_id, including calls
+    to unknown tools, failures and timeouts (with `ok` False), so tool
+    messages always line up with the calls. A timed-out call keeps running in
+    the background but its result is dropped.
+    """
+    results: List[Dict[str, Any]] = []
+    running: Dict[str, Any] = {}
+
+    for tool_call in tool_calls:
+        result = {"tool_call_id": tool_call["id"], "name": tool_call["name"], "ok": False}
+        results.append(result)
+
+        spec = specs.get(tool_call["name"])
+        if spec is None:
+            result["content"] = f"Unknown tool {tool_call['name']}; no result."
+            continue
+
+        args = _tool_args(spec, tool_call.get("args") or {})
+        key = memo_key(tool_call["name"], args)
+        result.update(spec=spec, key=key)
+
+        if key in running:
+            continue
+        found, cached = memo_lookup(tool_call["name"], args, memo)
+        if found:
+            result.update(ok=True, value=cached)
+            continue
+
+        # Copy the caller's context so searches count against its session and turn budgets
+        running[key] = (
+            _executor.submit(contextvars.copy_context().run, spec["tool"].invoke, args),
+            time.monotonic() + spec["timeout"],
+            spec,
+            args,
+            tool_call["name"]
+        )
+
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    for key, (future, deadline, spec, args, name) in running.items():
+        try:
+            value = future.result(timeout=max(deadline - time.monotonic(), 0))
+            memo_store(name, args, memo, value)
+            outcomes[key] = {"ok": True, "value": value}
+        except FutureTimeoutError:
+            outcomes[key] = {"ok": False, "content": f"{spec['label']}: timed out after {spec['timeout']:g}s; no result."}
+        except Exception as e:
+            outcomes[key] = {"ok": False, "content": f"{spec['label']}: failed ({e}); no result."}
+
+    for tool_call, result in zip(tool_calls, results):
+        spec = result.pop("spec", None)
+        key = result.pop("key", None)
+        if key in outcomes and "value" not in result:
+            result.update(outcomes[key])
+        if "value" in result:
+            result["content"] = f"{spec['label']}: {encode_tool_result(tool_call['name'], result.pop('value'), tool_call.get('args'))}"
+
+    return results
+
+def failed_round_reply(response: Any, fallback: str) -> Dict[str, Any]:
+    """Plain assistant reply for a round whose tool calls all failed, without the unanswered tool calls."""
+    content = response.content if isinstance(response.content, str) else ""
+    return {"role": "assistant", "content": content.strip() or fallback}
+
+def tool_messages(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn run_tool_calls results into tool messages for the follow-up LLM call."""
+    return [
+        {"role": "tool", "content": result["content"], "tool_call_id": result["tool_call_id"]}
+        for result in results
+    ]
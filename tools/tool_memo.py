@@ -0,0 +1,73 @@
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from tools.search_results import is_degraded
+from tools.static_payloads import normalize_arg
+
+# How long a memoized tool result stays valid within a session
+TOOL_MEMO_TTL_SECONDS = float(os.getenv("TOOL_MEMO_TTL", "900"))
+
+# Oldest entries are dropped beyond this many results per session
+TOOL_MEMO_MAX_ENTRIES = int(os.getenv("TOOL_MEMO_MAX_ENTRIES", "64"))
+
+def load_tool_memo(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a private copy of the session's tool memo that an agent can update and return."""
+    memo = state.get("tool_memo") or {"entries": {}, "hits": 0, "misses": 0, "expired": 0}
+    return {**memo, "entries": dict(memo["entries"])}
+
+def memo_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """Key a tool call on its name and canonicalized arguments."""
+    canonical = {
+        name: normalize_arg(value) if isinstance(value, str) else value
+        for name, value in args.items()
+    }
+    return f"{tool_name}:{json.dumps(canonical, sort_keys=True, default=str)}"
+
+def memo_lookup(tool_name: str, args: Dict[str, Any], memo: Dict[str, Any]) -> Tuple[bool, Any]:
+    """Return (True, result) if the session has a fresh result for this call, else (False, None)."""
+    key = memo_key(tool_name, args)
+    entries = memo["entries"]
+
+    entry = entries.get(key)
+    if entry is not None:
+        if entry["expires_at"] > time.time():
+            memo["hits"] += 1
+            return True, entry["result"]
+        del entries[key]
+        memo["expired"] += 1
+
+    memo["misses"] += 1
+    return False, None
+
+def memo_store(tool_name: str, args: Dict[str, Any], memo: Dict[str, Any], result: Any, ttl: Optional[float] = None) -> None:
+    """Remember a tool result for the session, dropping the oldest entries beyond the limit.
+
+    Degraded results (fallback text, or exercises with unavailable_sections;
+    see tools.search_results.is_degraded) aren't stored, so a later call
+    retries the search instead of replaying the fallback.
+    """
+    if is_degraded(result):
+        return
+
+    entries = memo["entries"]
+    entries[memo_key(tool_name, args)] = {
+        "result": result,
+        "expires_at": time.time() + (TOOL_MEMO_TTL_SECONDS if ttl is None else ttl)
+    }
+    # Dicts keep insertion order, so the first keys are the oldest
+    while len(entries) > TOOL_MEMO_MAX_ENTRIES:
+        del entries[next(iter(entries))]
+
+def tool_memo_stats(memo: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize a session's tool memo for reporting."""
+    memo = memo or {"entries": {}, "hits": 0, "misses": 0, "expired": 0}
+    lookups = memo["hits"] + memo["misses"]
+    return {
+        "entries": len(memo["entries"]),
+        "hits": memo["hits"],
+        "misses": memo["misses"],
+        "expired": memo["expired"],
+        "hit_rate": memo["hits"] / lookups if lookups else 0.0
+    }